@@ -1,364 +1,1260 @@
 import requests
-import json
-from typing import Dict, List, Tuple, Any
-from config import OLLAMA_URL, OLLAMA_MODEL
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import aiohttp
+import diskcache
+import asyncio
+import pandas as pd
+from typing import Dict, Iterable, List, Tuple, Any, Optional
+from config import OLLAMA_URL, OLLAMA_MODEL, OLLAMA_NUM_PARALLEL, OLLAMA_KEEP_ALIVE, OLLAMA_EMBEDDING_MODEL, LLM_CACHE_DIR, NEWS_PROMPT_CHAR_BUDGET
+from semantic_cache import SemanticCache
+from utils.json_utils import dumps as _dumps, dumps_compact as _dumps_compact, loads as _loads, JSONDecodeError, repair_json, JsonStreamTracker
+from pydantic import ValidationError
+from schemas import (
+    NewsAnalysis,
+    NEWS_ANALYSIS_SCHEMA,
+    TRADING_DECISION_SCHEMA,
+    FOLLOW_UP_QUESTIONS_SCHEMA,
+    FOLLOW_UP_QUESTIONS_BATCH_SCHEMA,
+    PERSONALITY_SELECTION_SCHEMA,
+    FULL_ANALYSIS_SCHEMA
+)
 import time
 from datetime import datetime
+from collections import OrderedDict, Counter
+from itertools import chain
+import hashlib
+import copy
+import random
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _norm(text: Any) -> str:
+    """Whitespace-collapsed, lowercase form of text used for near-duplicate detection"""
+    return " ".join(str(text).lower().split())
+
+
+def _backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """Seconds to wait before retry number attempt + 1: exponential growth with full jitter"""
+    return random.uniform(0.1, min(cap, base * (2 ** attempt)))
+
+
+# Above this many items, near-duplicate removal runs vectorized in pandas
+_VECTOR_DEDUPE_MIN = 64
+
+
+def _dedupe(items: Iterable[Any]) -> List[Any]:
+    """Drop items whose normalized text was already seen, keeping the first occurrence"""
+    items = list(items)
+    if len(items) > _VECTOR_DEDUPE_MIN:
+        series = pd.Series(items, dtype=object)
+        keys = series.astype(str).str.lower().str.split().str.join(" ")
+        return series[~keys.duplicated()].tolist()
+    
+    seen = set()
+    unique = []
+    for item in items:
+        digest = hashlib.blake2b(_norm(item).encode(), digest_size=8).digest()
+        if digest not in seen:
+            seen.add(digest)
+            unique.append(item)
+    return unique
+
+
+def _as_confidence(value: Any) -> float:
+    """Coerce a model-reported confidence to a non-negative number"""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _parses_as_json(text: str) -> bool:
+    """True if text, from its first brace on, is already a complete JSON document"""
+    start = text.find("{")
+    if start < 0:
+        return False
+    try:
+        _loads(text[start:])
+        return True
+    except JSONDecodeError:
+        return False
+
+
+async def _dumps_async(obj: Any) -> str:
+    """Serialize on a worker thread so large payloads don't stall other in-flight requests"""
+    return await asyncio.to_thread(_dumps, obj)
+
+# Fixed instructions sent through Ollama's system field. Keeping them constant and ahead of
+# the per-call data lets Ollama reuse the cached prefix instead of re-reading it every call.
+_NEWS_SYSTEM_PROMPT = """Analyze the news articles you are given and provide a structured analysis.
+
+Provide analysis in this exact JSON format:
+{
+    "summaries": [
+        "summary 1",
+        "summary 2"
+    ],
+    "themes": [
+        "theme 1",
+        "theme 2"
+    ],
+    "sentiment": "bullish/bearish/neutral",
+    "confidence": 0-100,
+    "key_points": [
+        "point 1",
+        "point 2"
+    ],
+    "market_impact": "description",
+    "reasoning": {
+        "bullish_factors": [
+            "factor 1",
+            "factor 2"
+        ],
+        "bearish_factors": [
+            "factor 1",
+            "factor 2"
+        ],
+        "conclusion": "detailed conclusion"
+    }
+}"""
+
+_DECISION_SYSTEM_PROMPT = """You are a trader with the trading personality given in the request. Analyze the ticker, news analysis and stock data you are given using graph-of-thought reasoning to make a trading decision.
+
+Follow this decision-making process:
+
+1. Build a graph of interconnected factors:
+   - Technical indicators
+   - News sentiment
+   - Market conditions
+   - Risk factors
+   - Trading psychology
+   - Price trends
+
+2. Analyze relationships between factors:
+   - How do they influence each other?
+   - What are the key dependencies?
+   - Which factors have the most impact?
+
+3. Consider multiple scenarios:
+   - Best case
+   - Worst case
+   - Most likely case
+
+4. Apply your trading personality's style:
+   - Risk tolerance
+   - Time horizon
+   - Decision criteria
+
+5. Make a final decision based on the complete analysis.
+
+Provide your decision in JSON format with the following structure:
+{
+    "action": "buy/sell/hold",
+    "confidence": 0-100,
+    "quantity": "number of shares",
+    "entry_price": "suggested entry price",
+    "stop_loss": "suggested stop loss price",
+    "take_profit": "suggested take profit price",
+    "reasoning": {
+        "technical_factors": ["factor1", "factor2", "..."],
+        "fundamental_factors": ["factor1", "factor2", "..."],
+        "risk_factors": ["factor1", "factor2", "..."],
+        "decision_process": "detailed explanation"
+    },
+    "scenarios": {
+        "best_case": "description",
+        "worst_case": "description",
+        "most_likely": "description"
+    },
+    "risk_assessment": {
+        "risk_level": "low/medium/high",
+        "key_risks": ["risk1", "risk2", "..."],
+        "mitigation_strategies": ["strategy1", "strategy2", "..."]
+    }
+}"""
+
+# Per-input size caps applied before text is embedded in a prompt, so prompt length
+# (and with it prefill latency) stays bounded however large the scraped input is
+_MAX_ARTICLE_CHARS = 1200
+_MAX_KEY_POINTS = 5
+_MAX_CONTENT_CHARS = 3000
+
+# Combined context size above which batched question prompts are split into sub-batches
+_QUESTIONS_BATCH_CHAR_BUDGET = 12000
+
+# Outermost {...} span, used to pull JSON out of a response wrapped in prose
+_JSON_RE = re.compile(r"\{.*\}", re.S)
+
+def _shutdown_loop(loop: asyncio.AbstractEventLoop, thread: threading.Thread, sessions: List) -> None:
+    """Close an analyzer's HTTP sessions and stop its event loop thread
+    
+    Called by AIAnalyzer.close, or by weakref.finalize once the analyzer is garbage
+    collected or the interpreter exits, so cleanup never keeps an analyzer alive.
+    """
+    async def close_sessions():
+        while sessions:
+            await sessions.pop().close()
+    
+    if threading.current_thread() is thread:
+        # Collected on its own loop: close the session there, then stop
+        loop.create_task(close_sessions()).add_done_callback(lambda _: loop.stop())
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(close_sessions(), loop).result(timeout=5)
+    except Exception as e:
+        logger.warning("⚠️ Failed to close the Ollama session: %s", e)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not thread.is_alive():
+            loop.close()
+
+# Fallback results returned when generation or parsing fails; callers get copies
+_DEFAULT_ANALYSIS = {
+    "sentiment": "neutral",
+    "confidence": 0,
+    "summaries": [],
+    "themes": [],
+    "key_points": [],
+    "market_impact": "Error analyzing news",
+    "reasoning": {
+        "bullish_factors": [],
+        "bearish_factors": [],
+        "conclusion": "Failed to analyze news data"
+    }
+}
+
+_DEFAULT_DECISION = {
+    "action": "hold",
+    "confidence": 0,
+    "quantity": 0,
+    "entry_price": 0,
+    "stop_loss": 0,
+    "take_profit": 0,
+    "reasoning": "Error generating decision",
+    "risk_assessment": "Error assessing risk"
+}
+
+_DEFAULT_QUESTIONS_TEMPLATE = (
+    {
+        "text": "What are {ticker}'s latest quarterly earnings results?",
+        "tool": "financial_data",
+        "rationale": "Understanding recent financial performance"
+    },
+    {
+        "text": "What recent news has affected {ticker}'s stock price?",
+        "tool": "news_search",
+        "rationale": "Identifying price catalysts"
+    },
+    {
+        "text": "How does {ticker}'s valuation compare to peers?",
+        "tool": "market_analysis",
+        "rationale": "Assessing relative value"
+    }
+)
+
+# Prompt skeletons built once at import; calls only splice in the per-request values
+_NEWS_PROMPT_TMPL = """News Articles:
+{news_json}"""
+
+_IMPACT_PROMPT_TMPL = """Synthesize these analyses into a market impact statement:
+
+Themes: {themes_json}
+Key Points: {key_points_json}
+Overall Sentiment: {sentiment}
+Confidence: {confidence}%
+
+Format response as JSON:
+{{
+    "market_impact": "your concise market impact analysis here"
+}}"""
+
+_CONCLUSION_PROMPT_TMPL = """Create a detailed conclusion based on these factors:
+
+Bullish Factors: {bullish_json}
+Bearish Factors: {bearish_json}
+Overall Sentiment: {sentiment}
+Confidence: {confidence}%
+
+Format response as JSON:
+{{
+    "conclusion": "your thorough conclusion here",
+    "sentiment": "{sentiment}",
+    "confidence": {confidence},
+    "bullish_summary": "summary of bullish factors",
+    "bearish_summary": "summary of bearish factors"
+}}"""
+
+_DECISION_PROMPT_TMPL = """Trading Personality: {personality}
+Ticker: {ticker}
+News Analysis: {news_json}
+Stock Data: {stock_json}"""
+
+_CONTENT_PROMPT_TMPL = """Analyze this {source} content and provide:
+1. A concise summary focused on market impact
+2. The sentiment (bullish/bearish/neutral) with explanation
+3. Three key insights that could affect trading decisions
+
+Content: {content}
+
+Respond in JSON format:
+{{
+    "summary": "...",
+    "sentiment": {{
+        "direction": "bullish/bearish/neutral",
+        "explanation": "..."
+    }},
+    "key_points": [
+        "point 1",
+        "point 2",
+        "point 3"
+    ],
+    "market_impact": "..."
+}}"""
+
+_QUESTIONS_SYSTEM_PROMPT = """Based on the context you are given about a ticker, generate 3 specific follow-up questions.
+
+Requirements:
+1. Each question must be about the given ticker specifically
+2. Focus on recent developments, financials, or competitive position
+3. Questions should help with trading decisions
+
+Respond in JSON format:
+{
+    "questions": [
+        {
+            "text": "What is TICKER's...",
+            "tool": "news_search/financial_data/market_analysis",
+            "rationale": "This will help understand..."
+        }
+    ]
+}"""
+
+_QUESTIONS_PROMPT_TMPL = """Ticker: {ticker}
+
+Context: {context}"""
+
+_QUESTIONS_BATCH_PROMPT_TMPL = """Generate 3 specific follow-up questions for each of the {count} tickers below.
+
+{contexts}
+
+Requirements:
+1. Each question must be about its own ticker specifically
+2. Focus on recent developments, financials, or competitive position
+3. Questions should help with trading decisions
+4. Return exactly one entry per ticker, using the ticker symbol as given
+
+Respond in JSON format:
+{{
+    "results": [
+        {{
+            "ticker": "TICKER",
+            "questions": [
+                {{
+                    "text": "What is TICKER's...",
+                    "tool": "news_search/financial_data/market_analysis",
+                    "rationale": "This will help understand..."
+                }}
+            ]
+        }}
+    ]
+}}"""
+
+_PERSONALITY_PROMPT = """Analyze current market conditions and select the most appropriate trading personality.
+
+Think through the following steps:
+
+1. Assess market conditions:
+   - Volatility levels
+   - Trend strength
+   - Sector rotations
+   - Risk sentiment
+
+2. Consider trading styles:
+   - Conservative: Focus on capital preservation
+   - Moderate: Balanced risk/reward
+   - Aggressive: High risk/high reward
+   - Data-Driven: Quantitative approach
+   - News-Focused: Event-driven trading
+   - Trend-Following: Momentum-based
+   - Counter-Trend: Mean reversion
+   - Technical: Chart patterns
+   - Fundamental: Value-based
+
+3. Match conditions to personality:
+   - Which style is best suited?
+   - What are the pros and cons?
+   - How would each style perform?
+
+Provide your response in JSON format with:
+{
+    "personality": "selected personality",
+    "market_conditions": ["condition1", "condition2", ...],
+    "reasoning": "detailed explanation",
+    "expected_performance": "why this personality would work well"
+}"""
+
+_FULL_ANALYSIS_PROMPT_TMPL = """You are a trading analyst. Using the data below, complete all four tasks in order.
+Later tasks should build on your answers to earlier ones.
+
+Ticker: {ticker}
+News Articles: {news_json}
+Stock Data: {stock_json}
+
+1. Select the most appropriate trading personality for current market conditions
+   (Conservative, Moderate, Aggressive, Data-Driven, News-Focused, Trend-Following,
+   Counter-Trend, Technical or Fundamental).
+2. Analyze the news articles: summarize them, find common themes, and weigh bullish
+   against bearish factors.
+3. Write 3 follow-up research questions specifically about {ticker}, each naming the
+   tool that would answer it (news_search, financial_data or market_analysis).
+4. Acting as the selected personality, make a trading decision for {ticker} using
+   the news analysis and stock data, considering best, worst and most likely scenarios.
+
+Provide your response in this exact JSON format:
+{{
+    "personality": {{
+        "personality": "selected personality",
+        "market_conditions": ["condition1", "condition2"],
+        "reasoning": "detailed explanation",
+        "expected_performance": "why this personality would work well"
+    }},
+    "news_analysis": {{
+        "summaries": ["summary 1", "summary 2"],
+        "themes": ["theme 1", "theme 2"],
+        "sentiment": "bullish/bearish/neutral",
+        "confidence": 0-100,
+        "key_points": ["point 1", "point 2"],
+        "market_impact": "description",
+        "reasoning": {{
+            "bullish_factors": ["factor 1", "factor 2"],
+            "bearish_factors": ["factor 1", "factor 2"],
+            "conclusion": "detailed conclusion"
+        }}
+    }},
+    "questions": [
+        {{
+            "text": "What is {ticker}'s...",
+            "tool": "news_search/financial_data/market_analysis",
+            "rationale": "This will help understand..."
+        }}
+    ],
+    "decision": {{
+        "action": "buy/sell/hold",
+        "confidence": 0-100,
+        "quantity": "number of shares",
+        "entry_price": "suggested entry price",
+        "stop_loss": "suggested stop loss price",
+        "take_profit": "suggested take profit price",
+        "reasoning": {{
+            "technical_factors": ["factor1", "factor2"],
+            "fundamental_factors": ["factor1", "factor2"],
+            "risk_factors": ["factor1", "factor2"],
+            "decision_process": "detailed explanation"
+        }},
+        "scenarios": {{
+            "best_case": "description",
+            "worst_case": "description",
+            "most_likely": "description"
+        }},
+        "risk_assessment": {{
+            "risk_level": "low/medium/high",
+            "key_risks": ["risk1", "risk2"],
+            "mitigation_strategies": ["strategy1", "strategy2"]
+        }}
+    }}
+}}"""
 
 class AIAnalyzer:
+    __slots__ = (
+        "base_url", "model", "headers", "_generate_url", "_embed_url",
+        "_buf", "_inflight", "_chroma", "_chroma_failed",
+        "_loop", "_loop_thread", "_loop_lock", "_sessions", "_loop_finalizer", "__weakref__"
+    )
+    
+    # Shared across instances so every analyzer reuses the same keep-alive sockets
+    _session = None
+    
+    # LRU of cleaned responses keyed by a hash of (model, prompt), shared by all analyzers.
+    # Values are (expiry timestamp or None, response).
+    _response_cache: "OrderedDict[str, Tuple[Optional[float], str]]" = OrderedDict()
+    _response_cache_lock = threading.Lock()
+    _response_cache_size = 1024
+    
+    # On-disk layer behind the LRU so responses survive restarts; False if it could not be opened
+    _disk_cache = None
+    
+    # News analyses reused for identical or near-duplicate news batches
+    _semantic_cache = SemanticCache()
+    
+    # (monotonic timestamp, personality) of the last selection; market conditions change slowly
+    _personality_cache: Optional[Tuple[float, str]] = None
+    _personality_ttl = 900
+    
+    # Serializes the lazy ChromaDB handler construction across worker threads
+    _chroma_lock = threading.Lock()
+    
     def __init__(self):
-        print("\n=== Initializing AI Analyzer ===")
+        logger.info("\n=== Initializing AI Analyzer ===")
         self.base_url = OLLAMA_URL
         self.model = OLLAMA_MODEL
+        self._generate_url = f"{self.base_url}/api/generate"
+        self._embed_url = f"{self.base_url}/api/embed"
         self.headers = {
             'Content-Type': 'application/json'
         }
+        self._get_session()  # Create the shared pool up front; instances read it from the class
+        self._buf = threading.local()  # Pending report text per thread, written out by flush_report()
+        self._inflight: Dict[str, asyncio.Future] = {}  # Generations currently awaiting Ollama, by cache key
+        
+        # ChromaDB is opened on first use; most calls never store anything
+        self._chroma = None
+        self._chroma_failed = False
+        
+        # Event loop and aiohttp session behind run_async, started on first use and kept
+        # for the analyzer's lifetime so every call reuses the same connection pool
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._sessions: List[aiohttp.ClientSession] = []  # At most one; a list so _shutdown_loop can close it without self
+        self._loop_finalizer: Optional[weakref.finalize] = None
+    
+    @property
+    def chroma_handler(self):
+        """ChromaDB handler, imported and constructed on first access; None if that failed"""
+        if self._chroma is None and not self._chroma_failed:
+            with self._chroma_lock:
+                if self._chroma is None and not self._chroma_failed:
+                    try:
+                        from chromadb_handler import ChromaDBHandler
+                        self._chroma = ChromaDBHandler.shared()
+                    except Exception as e:
+                        logger.warning("⚠️ Failed to initialize ChromaDB handler: %s", e)
+                        self._chroma_failed = True  # Don't retry on every save
+        return self._chroma
+    
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Return the pooled HTTP session used for synchronous Ollama calls"""
+        if cls._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=16,
+                max_retries=Retry(total=2, backoff_factor=0.1)
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({'Content-Type': 'application/json'})
+            cls._session = session
+        return cls._session
+    
+    @classmethod
+    def _get_disk_cache(cls) -> Optional[diskcache.Cache]:
+        """Return the on-disk response cache, or None when it is disabled or unavailable"""
+        if cls._disk_cache is None:
+            cls._disk_cache = False
+            if LLM_CACHE_DIR:
+                try:
+                    cls._disk_cache = diskcache.Cache(LLM_CACHE_DIR)
+                except Exception as e:
+                    logger.warning("⚠️ Failed to open LLM response cache at %s: %s", LLM_CACHE_DIR, e)
+        return cls._disk_cache or None
+    
+    def _cache_key(self, prompt: str, system: Optional[str] = None, format_schema: Optional[Dict] = None) -> str:
+        """Hash the model, system prompt, output format and prompt into a compact cache key"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.model}\x00{system or ''}\x00".encode())
+        if format_schema:
+            digest.update(_dumps(format_schema).encode())
+        digest.update(f"\x00{prompt}".encode())
+        return digest.hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Return a cached response from memory, then disk, and mark it as recently used"""
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at is None or expires_at > time.time():
+                    self._response_cache.move_to_end(key)
+                    return response
+                del self._response_cache[key]
+        
+        disk_cache = self._get_disk_cache()
+        if disk_cache is None:
+            return None
+        try:
+            response, expires_at = disk_cache.get(key, expire_time=True)
+        except Exception as e:
+            logger.warning("⚠️ Failed to read LLM response cache: %s", e)
+            return None
+        if response is not None:
+            self._remember(key, response, expires_at)
+        return response
+    
+    def _cache_put(self, key: str, response: str, ttl: Optional[float] = None) -> None:
+        """Store a successful response in memory and on disk, optionally expiring after ttl seconds"""
+        if not response:
+            return
+        self._remember(key, response, time.time() + ttl if ttl else None)
+        
+        disk_cache = self._get_disk_cache()
+        if disk_cache is None:
+            return
+        try:
+            disk_cache.set(key, response, expire=ttl)
+        except Exception as e:
+            logger.warning("⚠️ Failed to write LLM response cache: %s", e)
+    
+    def _forget_response(self, prompt: str, system: Optional[str] = None,
+                         format_schema: Optional[Dict] = None) -> None:
+        """Drop a cached response from memory and disk, e.g. one that failed validation"""
+        key = self._cache_key(prompt.replace("{{", "{").replace("}}", "}"), system, format_schema)
+        with self._response_cache_lock:
+            self._response_cache.pop(key, None)
         
-        # Initialize ChromaDB handler
+        disk_cache = self._get_disk_cache()
+        if disk_cache is None:
+            return
         try:
-            from chromadb_handler import ChromaDBHandler
-            self.chroma_handler = ChromaDBHandler()
-            # print("✅ ChromaDB handler initialized")
+            disk_cache.delete(key)
         except Exception as e:
-            print(f"⚠️ Failed to initialize ChromaDB handler: {str(e)}")
-            self.chroma_handler = None
+            logger.warning("⚠️ Failed to update LLM response cache: %s", e)
     
-    def _generate_response(self, prompt: str) -> str:
+    def _remember(self, key: str, response: str, expires_at: Optional[float]) -> None:
+        """Add a response to the in-memory LRU, evicting the least recently used entry"""
+        with self._response_cache_lock:
+            self._response_cache[key] = (expires_at, response)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > self._response_cache_size:
+                self._response_cache.popitem(last=False)
+    
+    def _generate_payload(self, prompt: str, system: Optional[str], format_schema: Optional[Dict]) -> Dict:
+        """Build the /api/generate request body"""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            # Constrain output to JSON, or to the given JSON schema when one is provided
+            "format": format_schema or "json",
+            "keep_alive": OLLAMA_KEEP_ALIVE  # Keep the model and its prompt cache loaded between calls
+        }
+        if system:
+            payload["system"] = system
+        return payload
+    
+    def generate_response(self, prompt: str, system: Optional[str] = None,
+                           format_schema: Optional[Dict] = None,
+                           cache_ttl: Optional[float] = None) -> str:
         """Generate response from Ollama"""
         try:
-            print("\n🤖 Generating AI response...")
-            print("📤 Sending prompt to Ollama...")
+            logger.info("\n🤖 Generating AI response...")
+            logger.info("📤 Sending prompt to Ollama...")
             
             # Clean prompt to use single curly braces
             prompt = prompt.replace("{{", "{").replace("}}", "}")
             
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                headers=self.headers,
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                },
-                timeout=60  # Add timeout
-            )
+            cache_key = self._cache_key(prompt, system, format_schema)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("♻️ Using cached AI response")
+                return cached
             
-            print(f"📥 Response status code: {response.status_code}")
+            fragments = []
+            for fragment in self._generate_response_stream(prompt, system, format_schema):
+                fragments.append(fragment)
             
-            response.raise_for_status()
-            result = response.json().get("response", "")
-            
-            if not result:
-                print("⚠️ Empty response received")
-                return ""
-                
-            # Clean response JSON
-            result = result.replace("{{", "{").replace("}}", "}")
-            result = result.strip()
+            result = self._clean_response("".join(fragments))
+            self._cache_put(cache_key, result, cache_ttl)
+            return result
             
-            # Fix common JSON formatting issues
-            result = re.sub(r',(\s*[}\]])', r'\1', result)  # Remove trailing commas
-            result = re.sub(r'}\s*{', '},{', result)  # Fix object separators
-            result = re.sub(r']\s*\[', '],[', result)  # Fix array separators
-            result = re.sub(r'(["\'])\s*\n\s*(["\'])', r'\1,\2', result)  # Add missing commas between strings
-            result = re.sub(r'(["\'])\s*(["\'])', r'\1,\2', result)  # Add missing commas between strings
+        except requests.exceptions.Timeout:
+            logger.error("❌ Request timed out")
+            return ""
+        except requests.exceptions.RequestException as e:
+            logger.error("❌ Network error: %s", e)
+            return ""
+        except Exception as e:
+            logger.exception("❌ Error generating response: %s", e)
+            return ""
+    
+    def _generate_response_stream(self, prompt: str, system: Optional[str] = None,
+                                  format_schema: Optional[Dict] = None):
+        """Yield response text fragments from Ollama as they are generated
+        
+        Stops reading once the first JSON object is complete, so any trailing
+        text the model adds after it is never generated.
+        """
+        tracker = JsonStreamTracker()
+        fragments = []
+        with self._session.post(
+            self._generate_url,
+            json=self._generate_payload(prompt, system, format_schema),
+            stream=True,
+            timeout=(3, 300)  # Fail fast on connect, allow long generations
+        ) as response:
+            logger.info("📥 Response status code: %s", response.status_code)
             
-            # Fix array elements missing commas
-            result = re.sub(r'(["\']\s*})\s*(\s*["\'])', r'\1,\2', result)  # Add missing commas between array elements
-            result = re.sub(r'(})\s*({)', r'},\1', result)  # Add missing commas between objects
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                event = _loads(line)
+                if event.get("error"):
+                    raise RuntimeError(event["error"])
+                if event.get("response"):
+                    yield event["response"]
+                    fragments.append(event["response"])
+                    if tracker.feed(event["response"]) and _parses_as_json("".join(fragments)):
+                        logger.debug("✂️ Complete JSON received, closing stream early")
+                        break
+                if event.get("done"):
+                    break
+    
+    def _client_session(self) -> aiohttp.ClientSession:
+        """Create an aiohttp session whose pool matches Ollama's parallel request slots"""
+        return aiohttp.ClientSession(
+            headers=self.headers,
+            connector=aiohttp.TCPConnector(limit=OLLAMA_NUM_PARALLEL),
+            timeout=aiohttp.ClientTimeout(sock_connect=3, sock_read=300)
+        )
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Return this analyzer's event loop, starting it on a daemon thread on first use"""
+        if self._loop is None:
+            with self._loop_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    thread = threading.Thread(target=loop.run_forever, name="ai-analyzer-loop", daemon=True)
+                    thread.start()
+                    self._loop_thread = thread
+                    self._sessions = []
+                    # Runs on close(), collection or exit without holding a reference to the analyzer
+                    self._loop_finalizer = weakref.finalize(self, _shutdown_loop, loop, thread, self._sessions)
+                    self._loop = loop
+        return self._loop
+    
+    async def _shared_session(self) -> aiohttp.ClientSession:
+        """Return this analyzer's HTTP session, created on its event loop on first use"""
+        if not self._sessions:
+            self._sessions.append(self._client_session())
+        return self._sessions[0]
+    
+    def run_async(self, coro_fn, *args):
+        """Run an async method to completion from synchronous code, passing the shared session as session
+        
+        Calls from every thread run on this analyzer's one long-lived event loop and share
+        its session, so connections are reused between calls and the pool limit caps
+        concurrent Ollama requests across threads. Coroutines already running on that
+        loop must await coro_fn directly instead.
+        """
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._loop_thread:
+            raise RuntimeError("run_async called from the analyzer's own event loop; await the coroutine instead")
+        
+        async def runner():
+            return await coro_fn(*args, session=await self._shared_session())
+        return asyncio.run_coroutine_threadsafe(runner(), loop).result()
+    
+    def close(self) -> None:
+        """Close the shared HTTP session and stop the event loop; the next run_async starts new ones"""
+        with self._loop_lock:
+            finalizer, self._loop_finalizer = self._loop_finalizer, None
+            self._loop = None
+        if finalizer is not None:
+            finalizer()
+    
+    def _clean_response(self, result: str) -> str:
+        """Clean and validate the JSON text returned by Ollama"""
+        if not result:
+            logger.warning("⚠️ Empty response received")
+            return ""
             
-            # Validate JSON structure
+        result = result.strip()
+        
+        # Well-formed responses need no repair; callers parse the text themselves, so it is not reformatted
+        try:
+            _loads(result)
+            logger.debug("📥 Response: %s", result)
+            return result
+        except JSONDecodeError:
+            pass
+        
+        # Parse the JSON span out of any surrounding prose, and repair only that span if it is still invalid
+        match = _JSON_RE.search(result)
+        if match:
+            result = match.group(0)
             try:
-                parsed_json = json.loads(result)
-                result = json.dumps(parsed_json, indent=4)  # Reformat with proper indentation
-            except json.JSONDecodeError as e:
-                print(f"⚠️ JSON parsing error: {str(e)}")
-                print("Raw content:", result)
-                
-                # Additional cleanup for specific cases
-                if '"key_points": [' in result:
-                    # Fix missing commas in arrays
-                    pattern = r'(\s*"[^"]+"\s*)\s+(\s*")'
-                    result = re.sub(pattern, r'\1,\2', result)
+                _loads(result)
+                logger.debug("📥 Response: %s", result)
+                return result
+            except JSONDecodeError:
+                pass
+        
+        # Fix missing/trailing commas and raw newlines in strings in one pass
+        repaired = repair_json(result)
+        try:
+            _loads(repaired)
+            logger.debug("📥 Response: %s", repaired)
+            return repaired
+        except JSONDecodeError:
+            pass
+        
+        # Last resort: collapse doubled braces echoed from prompt templates. This runs after every
+        # other attempt because it breaks valid compact nested JSON such as {"a":{"b":1}}
+        result = repair_json(result.replace("{{", "{").replace("}}", "}"))
+        
+        # Validate JSON structure
+        try:
+            _loads(result)
+        except JSONDecodeError as e:
+            logger.warning("⚠️ Failed to fix JSON structure: %s", e)
+            logger.debug("Raw content: %s", result)
+            return ""
+        
+        logger.debug("📥 Response: %s", result)
+        return result
+    
+    async def generate_response_async(self, prompt: str, session: aiohttp.ClientSession,
+                                       system: Optional[str] = None,
+                                       format_schema: Optional[Dict] = None,
+                                       use_cache: bool = True,
+                                       cache_ttl: Optional[float] = None) -> str:
+        """Generate response from Ollama without blocking the event loop"""
+        logger.info("\n🤖 Generating AI response...")
+        logger.info("📤 Sending prompt to Ollama...")
+        
+        # Clean prompt to use single curly braces
+        prompt = prompt.replace("{{", "{").replace("}}", "}")
+        
+        cache_key = self._cache_key(prompt, system, format_schema)
+        cached = self._cache_get(cache_key) if use_cache else None
+        if cached is not None:
+            logger.info("♻️ Using cached AI response")
+            return cached
+        
+        # Single-flight: concurrent callers with the same request share one generation.
+        # Futures only work within the loop that created them; run_async callers all share this
+        # analyzer's loop, but a coroutine driven by some other loop gets its own generation.
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None and inflight.get_loop() is loop:
+            logger.info("⏳ Waiting on identical in-flight request")
+            return await asyncio.shield(inflight)
+        
+        future = loop.create_future()
+        self._inflight[cache_key] = future
+        result = ""
+        try:
+            result = await self._request_generation_async(prompt, session, system, format_schema)
+            if use_cache:
+                self._cache_put(cache_key, result, cache_ttl)
+        finally:
+            if self._inflight.get(cache_key) is future:
+                del self._inflight[cache_key]
+            future.set_result(result)
+        return result
+    
+    def generate_responses_batch(self, prompts: List[str]) -> List[str]:
+        """Generate responses for several prompts submitted together, in input order"""
+        return self.run_async(self.generate_responses_batch_async, prompts)
+    
+    async def generate_responses_batch_async(self, prompts: List[str], session: aiohttp.ClientSession,
+                                             system: Optional[str] = None,
+                                             format_schema: Optional[Dict] = None) -> List[str]:
+        """Submit all prompts at once so Ollama can batch them across its parallel slots
+        
+        The session's connection pool caps requests in flight at OLLAMA_NUM_PARALLEL;
+        the rest queue client-side. Failed generations come back as empty strings.
+        """
+        logger.info("\n📦 Generating %s responses together...", len(prompts))
+        return list(await asyncio.gather(*(
+            self.generate_response_async(prompt, session, system, format_schema)
+            for prompt in prompts
+        )))
+    
+    async def _request_generation_async(self, prompt: str, session: aiohttp.ClientSession,
+                                        system: Optional[str], format_schema: Optional[Dict]) -> str:
+        """Stream one generation from Ollama and return the cleaned response"""
+        try:
+            tracker = JsonStreamTracker()
+            fragments = []
+            async with session.post(
+                self._generate_url,
+                json=self._generate_payload(prompt, system, format_schema)
+            ) as response:
+                logger.info("📥 Response status code: %s", response.status)
                 
-                # Try parsing again after additional cleanup
-                try:
-                    parsed_json = json.loads(result)
-                    result = json.dumps(parsed_json, indent=4)
-                except json.JSONDecodeError:
-                    print("⚠️ Failed to fix JSON structure")
-                    return ""
+                response.raise_for_status()
+                async for line in response.content:
+                    if not line.strip():
+                        continue
+                    event = _loads(line)
+                    if event.get("error"):
+                        raise RuntimeError(event["error"])
+                    if event.get("response"):
+                        fragments.append(event["response"])
+                        # Stop once the JSON is complete rather than waiting for trailing text
+                        if tracker.feed(event["response"]) and _parses_as_json("".join(fragments)):
+                            logger.debug("✂️ Complete JSON received, closing stream early")
+                            break
+                    if event.get("done"):
+                        break
             
-            print(f"📥 Response: {result}")
-            return result
+            return await asyncio.to_thread(self._clean_response, "".join(fragments))
             
-        except requests.exceptions.Timeout:
-            print("❌ Request timed out")
+        except asyncio.TimeoutError:
+            logger.error("❌ Request timed out")
             return ""
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Network error: {str(e)}")
+        except aiohttp.ClientError as e:
+            logger.error("❌ Network error: %s", e)
+            return ""
+        except Exception as e:
+            logger.exception("❌ Error generating response: %s", e)
             return ""
+    
+    async def _embed_async(self, text: str, session: aiohttp.ClientSession) -> Optional[List[float]]:
+        """Embed text with Ollama for semantic cache lookups"""
+        if not OLLAMA_EMBEDDING_MODEL or not text:
+            return None
+        try:
+            async with session.post(
+                self._embed_url,
+                json={
+                    "model": OLLAMA_EMBEDDING_MODEL,
+                    "input": text
+                }
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+            embeddings = data.get("embeddings") or []
+            return embeddings[0] if embeddings else None
         except Exception as e:
-            print(f"❌ Error generating response: {str(e)}")
-            return ""
+            logger.warning("⚠️ Failed to embed news for semantic cache: %s", e)
+            return None
+    
+    def _compact_news(self, news_data: List[Dict], k: int = 10,
+                      max_chars_per_article: int = _MAX_ARTICLE_CHARS,
+                      max_key_points: int = _MAX_KEY_POINTS) -> List[Dict]:
+        """Keep the first k articles and only the fields the analysis prompts use
+        
+        Prompt prefill time grows with prompt length, so URLs, images and full
+        article bodies are dropped, the article text and market impact are
+        clipped, and only the first few key points are kept.
+        """
+        compacted = []
+        for article in news_data[:k]:
+            text = article.get("summary") or article.get("content") or article.get("body") or ""
+            if not isinstance(text, str):
+                text = _dumps(text)
+            item = {
+                "title": article.get("title", ""),
+                "source": article.get("source", ""),
+                "published": article.get("published") or article.get("published_date") or article.get("date", ""),
+                "summary": text[:max_chars_per_article]
+            }
+            if article.get("sentiment"):
+                item["sentiment"] = article["sentiment"]
+            key_points = article.get("key_points")
+            if isinstance(key_points, list):
+                item["key_points"] = [str(point)[:max_chars_per_article] for point in key_points[:max_key_points]]
+            market_impact = article.get("market_impact")
+            if market_impact:
+                item["market_impact"] = str(market_impact)[:max_chars_per_article]
+            # Drop empty fields so they cost no prompt tokens
+            compacted.append({key: value for key, value in item.items() if value})
+        return compacted
+    
+    def _news_text(self, news_data: List[Dict]) -> str:
+        """Flatten a news batch into the text used for cache lookups"""
+        parts = []
+        for article in news_data:
+            parts.append(str(article.get("summary") or article.get("content") or article.get("title") or ""))
+            parts.extend(str(point) for point in article.get("key_points") or [])
+        return "\n".join(parts)
+    
+    def _report_lines(self) -> List[str]:
+        """Return the calling thread's queued report lines
+        
+        Each thread keeps its own buffer so analyses running in parallel never
+        flush lines from each other's reports.
+        """
+        lines = getattr(self._buf, "lines", None)
+        if lines is None:
+            lines = self._buf.lines = []
+        return lines
+    
+    def _report(self, text: str = "") -> None:
+        """Queue a line of report output for the next flush_report()"""
+        if logger.isEnabledFor(logging.INFO):
+            self._report_lines().append(text)
+    
+    def flush_report(self) -> None:
+        """Log all queued report output as a single record"""
+        lines = self._report_lines()
+        if lines:
+            logger.info("%s", "\n".join(lines))
+            lines.clear()
     
     def _print_analysis_step(self, step_num: int, step_name: str, data: Dict) -> None:
-        """Helper to print analysis steps in a structured way"""
-        print(f"\n=== Step {step_num}: {step_name} ===")
+        """Helper to queue analysis steps in a structured way"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        self._report(f"\n=== Step {step_num}: {step_name} ===")
         for key, value in data.items():
             if isinstance(value, list):
-                print(f"\n{key.replace('_', ' ').title()}:")
+                self._report(f"\n{key.replace('_', ' ').title()}:")
                 for item in value:
-                    print(f"  • {item}")
+                    self._report(f"  • {item}")
             else:
-                print(f"\n{key.replace('_', ' ').title()}: {value}")
+                self._report(f"\n{key.replace('_', ' ').title()}: {value}")
     
     def analyze_news(self, news_data: List[Dict]) -> Dict:
         """Analyze news data using chain-of-thought reasoning"""
-        print("\n🔍 Starting Chain-of-Thought News Analysis...")
-        print(f"📰 Analyzing {len(news_data)} news articles")
+        return self.run_async(self.analyze_news_async, news_data)
+    
+    async def analyze_news_async(self, news_data: List[Dict], session: aiohttp.ClientSession) -> Dict:
+        """Async version of analyze_news that shares the caller's HTTP session"""
+        self._report("\n🔍 Starting Chain-of-Thought News Analysis...")
+        self._report(f"📰 Analyzing {len(news_data)} news articles")
+        
+        # Echo the incoming articles; skip building the lines entirely when nothing would be logged
+        if logger.isEnabledFor(logging.INFO):
+            for i, article in enumerate(news_data):
+                self._report(f"\nArticle {i+1}:")
+                self._report(f"Summary: {article.get('summary', 'No summary')[:100]}...")
+                self._report(f"Sentiment: {article.get('sentiment', 'No sentiment')}")
+                self._report(f"Key points: {len(article.get('key_points', []))} points")
+        self.flush_report()
+        
+        news_data = self._compact_news(news_data)
         
-        # Add debugging for news data
-        for i, article in enumerate(news_data):
-            print(f"\nArticle {i+1}:")
-            print(f"Summary: {article.get('summary', 'No summary')[:100]}...")
-            print(f"Sentiment: {article.get('sentiment', 'No sentiment')}")
-            print(f"Key points: {len(article.get('key_points', []))} points")
+        # Tiered cache lookup: exact news text first, then nearest embedding
+        news_text = self._news_text(news_data)
+        cached = self._semantic_cache.get_exact(news_text)
+        embedding = None
+        if cached is None:
+            embedding = await self._embed_async(news_text, session)
+            if embedding is not None:
+                cached = self._semantic_cache.get_similar(embedding)
+        if cached is not None:
+            logger.info("♻️ Using cached analysis for matching news")
+            return cached
+        
+        analysis = await self._analyze_news_chunks(news_data, session)
+        if analysis != _DEFAULT_ANALYSIS:
+            self._semantic_cache.put(news_text, embedding, analysis)
+        return analysis
+    
+    async def _analyze_news_chunks(self, news_data: List[Dict], session: aiohttp.ClientSession) -> Dict:
+        """Analyze news in one prompt when it fits, otherwise in chunks whose results are combined"""
+        # One call returning the combined schema replaces N/3 chunk calls plus two synthesis calls
+        news_size = sum(len(_dumps_compact(article)) for article in news_data)
+        if news_size <= NEWS_PROMPT_CHAR_BUDGET:
+            return await self._analyze_news_single(news_data, session)
         
         # Break down analysis into smaller chunks if too many articles
         chunk_size = 3
+        logger.info("\n📏 News batch is %s chars, over the %s char budget", news_size, NEWS_PROMPT_CHAR_BUDGET)
         if len(news_data) > chunk_size:
-            print(f"\n📦 Breaking analysis into chunks of {chunk_size} articles...")
+            logger.info("\n📦 Breaking analysis into chunks of %s articles...", chunk_size)
             chunks = [news_data[i:i + chunk_size] for i in range(0, len(news_data), chunk_size)]
             
-            all_analyses = []
-            for i, chunk in enumerate(chunks):
-                print(f"\n🔄 Analyzing chunk {i+1}/{len(chunks)}...")
-                chunk_analysis = self._analyze_news_chunk(chunk)
-                if chunk_analysis:
-                    all_analyses.append(chunk_analysis)
+            # Chunks are independent, so analyze them concurrently up to Ollama's parallel slots
+            semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+            
+            async def analyze_chunk(i: int, chunk: List[Dict]) -> Dict:
+                async with semaphore:
+                    logger.info("\n🔄 Analyzing chunk %s/%s...", i + 1, len(chunks))
+                    return await self._analyze_news_chunk(chunk, session)
+            
+            chunk_analyses = await asyncio.gather(*(analyze_chunk(i, chunk) for i, chunk in enumerate(chunks)))
+            all_analyses = [chunk_analysis for chunk_analysis in chunk_analyses if chunk_analysis]
             
             # Combine chunk analyses
-            return self._combine_analyses(all_analyses)
+            return await self._combine_analyses(all_analyses, session)
         else:
             # Analyze single chunk
-            return self._analyze_news_chunk(news_data)
+            return await self._analyze_news_chunk(news_data, session)
     
-    def _analyze_news_chunk(self, news_chunk: List[Dict]) -> Dict:
+    async def _analyze_news_single(self, news_data: List[Dict], session: aiohttp.ClientSession) -> Dict:
+        """Analyze the whole news batch with a single prompt"""
+        analysis = await self._analyze_news_chunk(news_data, session)
+        if analysis and analysis != _DEFAULT_ANALYSIS:
+            self._save_to_chroma(
+                analysis=analysis,
+                metadata={
+                    "timestamp": str(datetime.now()),
+                    "num_articles": len(news_data),
+                    "sentiment": analysis.get("sentiment", "neutral"),
+                    "confidence": analysis.get("confidence", 0)
+                }
+            )
+        return analysis
+    
+    async def _analyze_news_chunk(self, news_chunk: List[Dict], session: aiohttp.ClientSession) -> Dict:
         """Analyze a smaller chunk of news articles"""
         max_retries = 3
         
-        # Create prompt for chunk analysis
-        prompt = f"""Analyze these news articles and provide a structured analysis:
-
-News Articles:
-{json.dumps(news_chunk, indent=2)}
-
-Provide analysis in this exact JSON format:
-{{
-    "summaries": [
-        "summary 1",
-        "summary 2"
-    ],
-    "themes": [
-        "theme 1",
-        "theme 2"
-    ],
-    "sentiment": "bullish/bearish/neutral",
-    "confidence": 0-100,
-    "key_points": [
-        "point 1",
-        "point 2"
-    ],
-    "market_impact": "description",
-    "reasoning": {{
-        "bullish_factors": [
-            "factor 1",
-            "factor 2"
-        ],
-        "bearish_factors": [
-            "factor 1",
-            "factor 2"
-        ],
-        "conclusion": "detailed conclusion"
-    }}
-}}"""
+        # Only the articles vary per call; the instructions go in the system prompt
+        prompt = _NEWS_PROMPT_TMPL.format(news_json=await _dumps_async(news_chunk))
 
         for attempt in range(max_retries):
             try:
-                response = self._generate_response(prompt)
+                # A retry must not be answered with the cached response that just failed
+                response = await self.generate_response_async(
+                    prompt, session, system=_NEWS_SYSTEM_PROMPT, format_schema=NEWS_ANALYSIS_SCHEMA,
+                    use_cache=attempt == 0
+                )
                 if not response:
-                    print(f"⚠️ Empty response on attempt {attempt + 1}")
+                    logger.warning("⚠️ Empty response on attempt %s", attempt + 1)
+                    if attempt < max_retries - 1:
+                        await asyncio.sleep(_backoff_delay(attempt))
                     continue
-                    
-                # Clean the response
-                response = response.strip()
-                response = re.sub(r',(\s*[}\]])', r'\1', response)  # Remove trailing commas
-                response = re.sub(r'}\s*{', '},{', response)  # Fix object separators
-                response = re.sub(r']\s*\[', '],[', response)  # Fix array separators
-                
-                analysis = json.loads(response)
-                
-                # Validate analysis structure
-                required_fields = ['summaries', 'themes', 'sentiment', 'confidence', 'key_points', 'market_impact', 'reasoning']
-                missing_fields = [field for field in required_fields if field not in analysis]
-                
-                if missing_fields:
-                    print(f"⚠️ Missing fields in analysis: {missing_fields}")
-                    # Add default values for missing fields
-                    for field in missing_fields:
-                        if field == 'sentiment':
-                            analysis[field] = 'neutral'
-                        elif field == 'confidence':
-                            analysis[field] = 0
-                        elif field in ['summaries', 'themes', 'key_points']:
-                            analysis[field] = []
-                        elif field == 'market_impact':
-                            analysis[field] = "No market impact analysis available"
-                        elif field == 'reasoning':
-                            analysis[field] = {
-                                "bullish_factors": [],
-                                "bearish_factors": [],
-                                "conclusion": "No detailed conclusion available"
-                            }
-                
-                # Ensure arrays have proper commas
-                for field in ['summaries', 'themes', 'key_points']:
-                    if isinstance(analysis.get(field), list):
-                        analysis[field] = [str(item).strip() for item in analysis[field] if item]
-                
-                # Print detailed analysis steps
-                print("\n📰 News Analysis Process:")
-                self._print_analysis_step(1, "Article Summaries", {"summaries": analysis.get("summaries", [])})
-                self._print_analysis_step(2, "Common Themes", {"themes": analysis.get("themes", [])})
-                self._print_analysis_step(3, "Market Impact Analysis", {
-                    "sentiment": analysis.get("sentiment", "neutral"),
-                    "confidence": f"{analysis.get('confidence', 0)}%",
-                    "market_impact": analysis.get("market_impact", "")
-                })
-                self._print_analysis_step(4, "Bullish vs Bearish Analysis", {
-                    "bullish_factors": analysis.get("reasoning", {}).get("bullish_factors", []),
-                    "bearish_factors": analysis.get("reasoning", {}).get("bearish_factors", [])
-                })
-                self._print_analysis_step(5, "Final Conclusion", {
-                    "conclusion": analysis.get("reasoning", {}).get("conclusion", ""),
-                    "key_points": analysis.get("key_points", [])
-                })
                 
+                # _clean_response has already repaired and validated the JSON text
+                analysis = self._normalize_news_analysis(response)
+                self._print_news_analysis(analysis)
                 return analysis
                 
-            except json.JSONDecodeError as e:
-                print(f"❌ Failed to parse AI response on attempt {attempt + 1}: {str(e)}")
-                print("Raw response:", response[:500])
+            except (JSONDecodeError, ValidationError) as e:
+                logger.error("❌ Failed to parse AI response on attempt %s: %s", attempt + 1, e)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Raw response: %s", response[:500])
+                # Don't let later calls for these articles start from the same bad response
+                self._forget_response(prompt, _NEWS_SYSTEM_PROMPT, NEWS_ANALYSIS_SCHEMA)
                 if attempt == max_retries - 1:
                     return self._get_default_analysis()
-                time.sleep(2)  # Wait before retrying
+                await asyncio.sleep(_backoff_delay(attempt))  # Back off before retrying
                 
             except Exception as e:
-                print(f"❌ Error in analysis on attempt {attempt + 1}: {str(e)}")
+                logger.exception("❌ Error in analysis on attempt %s: %s", attempt + 1, e)
                 if attempt == max_retries - 1:
                     return self._get_default_analysis()
-                time.sleep(2)  # Wait before retrying
+                await asyncio.sleep(_backoff_delay(attempt))  # Back off before retrying
+        
+        return self._get_default_analysis()
+    
+    def _normalize_news_analysis(self, analysis: Any) -> Dict:
+        """Validate a news analysis (JSON text or dict), filling defaults for missing fields
+        
+        Raises ValidationError if a field is present but has the wrong shape.
+        """
+        if isinstance(analysis, (str, bytes)):
+            return NewsAnalysis.model_validate_json(analysis).model_dump()
+        return NewsAnalysis.model_validate(analysis).model_dump()
+    
+    def _print_news_analysis(self, analysis: Dict) -> None:
+        """Print the chain-of-thought steps of a news analysis"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        reasoning = analysis.get("reasoning") or {}
+        
+        self._report("\n📰 News Analysis Process:")
+        self._print_analysis_step(1, "Article Summaries", {"summaries": analysis.get("summaries", [])})
+        self._print_analysis_step(2, "Common Themes", {"themes": analysis.get("themes", [])})
+        self._print_analysis_step(3, "Market Impact Analysis", {
+            "sentiment": analysis.get("sentiment", "neutral"),
+            "confidence": f"{analysis.get('confidence', 0)}%",
+            "market_impact": analysis.get("market_impact", "")
+        })
+        self._print_analysis_step(4, "Bullish vs Bearish Analysis", {
+            "bullish_factors": reasoning.get("bullish_factors", []),
+            "bearish_factors": reasoning.get("bearish_factors", [])
+        })
+        self._print_analysis_step(5, "Final Conclusion", {
+            "conclusion": reasoning.get("conclusion", ""),
+            "key_points": analysis.get("key_points", [])
+        })
+        self.flush_report()
     
     def _save_to_chroma(self, analysis: Dict, metadata: Dict) -> bool:
         """Helper method to save analysis to ChromaDB"""
         if not self.chroma_handler:
-            print("⚠️ ChromaDB handler not available, skipping save")
+            logger.warning("⚠️ ChromaDB handler not available, skipping save")
             return False
             
         try:
-            print("\n💾 Saving analysis to ChromaDB...")
-            success = self.chroma_handler.save_document(
+            logger.info("\n💾 Saving analysis to ChromaDB...")
+            success = self.chroma_handler.save_json_document(
                 collection_name="summary",
-                document=json.dumps(analysis, indent=4),
+                payload=analysis,  # Serialized once by the handler
                 metadata=metadata
             )
             if success:
-                print("✅ Analysis saved to ChromaDB")
+                logger.info("✅ Analysis saved to ChromaDB")
             return success
         except Exception as e:
-            print(f"⚠️ Failed to save to ChromaDB: {str(e)}")
+            logger.warning("⚠️ Failed to save to ChromaDB: %s", e)
             return False
     
-    def _combine_analyses(self, analyses: List[Dict]) -> Dict:
+    async def _combine_analyses(self, analyses: List[Dict], session: aiohttp.ClientSession) -> Dict:
         """Combine multiple chunk analyses into a single analysis"""
         if not analyses:
             return self._get_default_analysis()
             
-        print("\n🔄 Combining chunk analyses...")
+        logger.info("\n🔄 Combining chunk analyses...")
         
-        # Combine all summaries and themes
-        all_summaries = []
-        all_themes = []
-        all_key_points = []
-        all_bullish = []
-        all_bearish = []
+        # Combine all summaries and themes in one pass per field, ignoring case and whitespace differences
+        reasonings = [analysis.get("reasoning") or {} for analysis in analyses]
+        all_summaries = _dedupe(chain.from_iterable(analysis.get("summaries", []) for analysis in analyses))
+        all_themes = _dedupe(chain.from_iterable(analysis.get("themes", []) for analysis in analyses))
+        all_key_points = _dedupe(chain.from_iterable(analysis.get("key_points", []) for analysis in analyses))
+        all_bullish = _dedupe(chain.from_iterable(reasoning.get("bullish_factors", []) for reasoning in reasonings))
+        all_bearish = _dedupe(chain.from_iterable(reasoning.get("bearish_factors", []) for reasoning in reasonings))
         
-        # Track sentiment counts and total confidence
-        sentiment_counts = {"bullish": 0, "bearish": 0, "neutral": 0}
-        total_confidence = 0
+        # Track per-sentiment confidence weight and chunk counts
+        sentiment_weights = Counter()
+        sentiment_counts = Counter()
         
         for analysis in analyses:
-            all_summaries.extend(analysis.get("summaries", []))
-            all_themes.extend(analysis.get("themes", []))
-            all_key_points.extend(analysis.get("key_points", []))
-            all_bullish.extend(analysis.get("reasoning", {}).get("bullish_factors", []))
-            all_bearish.extend(analysis.get("reasoning", {}).get("bearish_factors", []))
-            
-            sentiment = analysis.get("sentiment", "neutral")
-            sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
-            total_confidence += analysis.get("confidence", 0)
-        
-        # Calculate overall sentiment and confidence
-        overall_sentiment = max(sentiment_counts.items(), key=lambda x: x[1])[0]
-        avg_confidence = total_confidence / len(analyses)
+            sentiment = str(analysis.get("sentiment", "neutral")).lower()
+            sentiment_weights[sentiment] += _as_confidence(analysis.get("confidence", 0))
+            sentiment_counts[sentiment] += 1
         
-        # Deduplicate lists while preserving order
-        all_summaries = list(dict.fromkeys(all_summaries))
-        all_themes = list(dict.fromkeys(all_themes))
-        all_key_points = list(dict.fromkeys(all_key_points))
-        all_bullish = list(dict.fromkeys(all_bullish))
-        all_bearish = list(dict.fromkeys(all_bearish))
+        # Confidence-weighted vote, falling back to plain counts when no chunk reports any confidence
+        votes = sentiment_weights if sum(sentiment_weights.values()) > 0 else sentiment_counts
+        overall_sentiment = votes.most_common(1)[0][0]
+        # Average confidence of the chunks that agree with the overall sentiment
+        avg_confidence = sentiment_weights[overall_sentiment] / sentiment_counts[overall_sentiment]
         
         # Generate combined market impact and conclusion with enforced JSON structure
-        impact_prompt = f"""Synthesize these analyses into a market impact statement:
-
-Themes: {json.dumps(all_themes)}
-Key Points: {json.dumps(all_key_points)}
-Overall Sentiment: {overall_sentiment}
-Confidence: {avg_confidence}%
-
-Format response as JSON:
-{{
-    "market_impact": "your concise market impact analysis here"
-}}"""
+        impact_prompt = _IMPACT_PROMPT_TMPL.format(
+            themes_json=_dumps_compact(all_themes),
+            key_points_json=_dumps_compact(all_key_points),
+            sentiment=overall_sentiment,
+            confidence=avg_confidence
+        )
         
-        conclusion_prompt = f"""Create a detailed conclusion based on these factors:
-
-Bullish Factors: {json.dumps(all_bullish)}
-Bearish Factors: {json.dumps(all_bearish)}
-Overall Sentiment: {overall_sentiment}
-Confidence: {avg_confidence}%
-
-Format response as JSON:
-{{
-    "conclusion": "your thorough conclusion here",
-    "sentiment": "{overall_sentiment}",
-    "confidence": {avg_confidence},
-    "bullish_summary": "summary of bullish factors",
-    "bearish_summary": "summary of bearish factors"
-}}"""
+        conclusion_prompt = _CONCLUSION_PROMPT_TMPL.format(
+            bullish_json=_dumps_compact(all_bullish),
+            bearish_json=_dumps_compact(all_bearish),
+            sentiment=overall_sentiment,
+            confidence=avg_confidence
+        )
         
+        # The two synthesis prompts are independent, so generate them concurrently
+        impact_text, conclusion_text = await asyncio.gather(
+            self.generate_response_async(impact_prompt, session, cache_ttl=3600),
+            self.generate_response_async(conclusion_prompt, session, cache_ttl=3600)
+        )
         try:
-            impact_response = json.loads(self._generate_response(impact_prompt))
-            conclusion_response = json.loads(self._generate_response(conclusion_prompt))
+            impact_response = _loads(impact_text)
+            conclusion_response = _loads(conclusion_text)
             
             combined_impact = impact_response.get("market_impact", "No market impact available")
             combined_conclusion = conclusion_response.get("conclusion", "No conclusion available")
             
-        except json.JSONDecodeError:
-            print("⚠️ Error parsing impact/conclusion JSON, using defaults")
+        except JSONDecodeError:
+            logger.warning("⚠️ Error parsing impact/conclusion JSON, using defaults")
             combined_impact = "Error generating market impact"
             combined_conclusion = "Error generating conclusion"
         
@@ -391,19 +1287,7 @@ Format response as JSON:
     
     def _get_default_analysis(self) -> Dict:
         """Return default analysis structure when errors occur"""
-        return {
-            "sentiment": "neutral",
-            "confidence": 0,
-            "summaries": [],
-            "themes": [],
-            "key_points": [],
-            "market_impact": "Error analyzing news",
-            "reasoning": {
-                "bullish_factors": [],
-                "bearish_factors": [],
-                "conclusion": "Failed to analyze news data"
-            }
-        }
+        return copy.deepcopy(_DEFAULT_ANALYSIS)
     
     def generate_trading_decision(self, 
                                 ticker: str,
@@ -411,119 +1295,124 @@ Format response as JSON:
                                 stock_data: Dict,
                                 personality: str) -> Dict:
         """Generate trading decision using graph-of-thought reasoning"""
-        print(f"\n🎯 Starting Graph-of-Thought Trading Analysis for {ticker}...")
-        print(f"\nTrading Personality: {personality}")
-        print(f"Current Price: ${stock_data.get('current_price', 0):.2f}")
-        print(f"Daily Change: {stock_data.get('daily_change', 0):.2f}%")
+        return self.run_async(self.generate_trading_decision_async, ticker, news_analysis, stock_data, personality)
+    
+    async def generate_trading_decision_async(self,
+                                              ticker: str,
+                                              news_analysis: Dict,
+                                              stock_data: Dict,
+                                              personality: str,
+                                              session: aiohttp.ClientSession) -> Dict:
+        """Async version of generate_trading_decision that shares the caller's HTTP session"""
+        self._report(f"\n🎯 Starting Graph-of-Thought Trading Analysis for {ticker}...")
+        self._report(f"\nTrading Personality: {personality}")
+        self._report(f"Current Price: ${stock_data.get('current_price', 0):.2f}")
+        self._report(f"Daily Change: {stock_data.get('daily_change', 0):.2f}%")
+        self.flush_report()
         
-        prompt = f"""As a {personality} trader, analyze the following data using graph-of-thought reasoning to make a trading decision:
-
-Ticker: {ticker}
-News Analysis: {json.dumps(news_analysis, indent=2)}
-Stock Data: {json.dumps(stock_data, indent=2)}
-
-Follow this decision-making process:
-
-1. Build a graph of interconnected factors:
-   - Technical indicators
-   - News sentiment
-   - Market conditions
-   - Risk factors
-   - Trading psychology
-   - Price trends
-
-2. Analyze relationships between factors:
-   - How do they influence each other?
-   - What are the key dependencies?
-   - Which factors have the most impact?
-
-3. Consider multiple scenarios:
-   - Best case
-   - Worst case
-   - Most likely case
-
-4. Apply {personality} trading style:
-   - Risk tolerance
-   - Time horizon
-   - Decision criteria
-
-5. Make a final decision based on the complete analysis.
-
-Provide your decision in JSON format with the following structure:
-{{
-    "action": "buy/sell/hold",
-    "confidence": 0-100,
-    "quantity": "number of shares",
-    "entry_price": "suggested entry price",
-    "stop_loss": "suggested stop loss price",
-    "take_profit": "suggested take profit price",
-    "reasoning": {{
-        "technical_factors": ["factor1", "factor2", "..."],
-        "fundamental_factors": ["factor1", "factor2", "..."],
-        "risk_factors": ["factor1", "factor2", "..."],
-        "decision_process": "detailed explanation"
-    }},
-    "scenarios": {{
-        "best_case": "description",
-        "worst_case": "description",
-        "most_likely": "description"
-    }},
-    "risk_assessment": {{
-        "risk_level": "low/medium/high",
-        "key_risks": ["risk1", "risk2", "..."],
-        "mitigation_strategies": ["strategy1", "strategy2", "..."]
-    }}
-}}"""
+        prompt = _DECISION_PROMPT_TMPL.format(
+            personality=personality,
+            ticker=ticker,
+            news_json=await _dumps_async(news_analysis),
+            stock_json=await _dumps_async(stock_data)
+        )
         
-        response = self._generate_response(prompt)
-        try:
-            decision = json.loads(response)
-            
-            # Print detailed decision process
-            print("\n📊 Trading Decision Process:")
-            
-            self._print_analysis_step(1, "Technical Analysis", {
-                "technical_factors": decision.get("reasoning", {}).get("technical_factors", [])
-            })
-            
-            self._print_analysis_step(2, "Fundamental Analysis", {
-                "fundamental_factors": decision.get("reasoning", {}).get("fundamental_factors", [])
-            })
-            
-            self._print_analysis_step(3, "Scenario Analysis", decision.get("scenarios", {
-                "best_case": "Not available",
-                "worst_case": "Not available",
-                "most_likely": "Not available"
-            }))
-            
-            self._print_analysis_step(4, "Risk Assessment", {
-                "risk_level": decision.get("risk_assessment", {}).get("risk_level", "unknown"),
-                "key_risks": decision.get("risk_assessment", {}).get("key_risks", []),
-                "mitigation_strategies": decision.get("risk_assessment", {}).get("mitigation_strategies", [])
-            })
-            
-            self._print_analysis_step(5, "Final Decision", {
-                "action": decision.get("action", "hold").upper(),
-                "confidence": f"{decision.get('confidence', 0)}%",
-                "quantity": decision.get("quantity", 0),
-                "entry_price": f"${decision.get('entry_price', 0)}",
-                "stop_loss": f"${decision.get('stop_loss', 0)}",
-                "take_profit": f"${decision.get('take_profit', 0)}",
-                "decision_process": decision.get("reasoning", {}).get("decision_process", "")
-            })
+        max_retries = 3
+        for attempt in range(max_retries):
+            # A retry must not be answered with the cached response that just failed
+            response = await self.generate_response_async(
+                prompt, session, system=_DECISION_SYSTEM_PROMPT, format_schema=TRADING_DECISION_SCHEMA,
+                use_cache=attempt == 0
+            )
+            try:
+                decision = _loads(response)
+            except JSONDecodeError as e:
+                logger.error("❌ Failed to parse trading decision on attempt %s: %s", attempt + 1, e)
+            else:
+                if isinstance(decision, dict):
+                    self._print_trading_decision(decision)
+                    return decision
+                logger.error("❌ Trading decision on attempt %s is not a JSON object", attempt + 1)
             
-            return decision
-        except:
-            return {
-                "action": "hold",
-                "confidence": 0,
-                "quantity": 0,
-                "entry_price": 0,
-                "stop_loss": 0,
-                "take_profit": 0,
-                "reasoning": "Error generating decision",
-                "risk_assessment": "Error assessing risk"
-            }
+            # Don't let later calls for this ticker start from the same bad response
+            self._forget_response(prompt, _DECISION_SYSTEM_PROMPT, TRADING_DECISION_SCHEMA)
+            if attempt < max_retries - 1:
+                await asyncio.sleep(_backoff_delay(attempt))  # Back off before retrying
+        
+        return self._get_default_decision()
+    
+    def _print_trading_decision(self, decision: Dict) -> None:
+        """Print the graph-of-thought steps of a trading decision"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        reasoning = decision.get("reasoning") or {}
+        if not isinstance(reasoning, dict):
+            reasoning = {}
+        risk = decision.get("risk_assessment") or {}
+        if not isinstance(risk, dict):
+            risk = {}
+        
+        self._report("\n📊 Trading Decision Process:")
+        
+        self._print_analysis_step(1, "Technical Analysis", {
+            "technical_factors": reasoning.get("technical_factors", [])
+        })
+        
+        self._print_analysis_step(2, "Fundamental Analysis", {
+            "fundamental_factors": reasoning.get("fundamental_factors", [])
+        })
+        
+        self._print_analysis_step(3, "Scenario Analysis", decision.get("scenarios", {
+            "best_case": "Not available",
+            "worst_case": "Not available",
+            "most_likely": "Not available"
+        }))
+        
+        self._print_analysis_step(4, "Risk Assessment", {
+            "risk_level": risk.get("risk_level", "unknown"),
+            "key_risks": risk.get("key_risks", []),
+            "mitigation_strategies": risk.get("mitigation_strategies", [])
+        })
+        
+        self._print_analysis_step(5, "Final Decision", {
+            "action": decision.get("action", "hold").upper(),
+            "confidence": f"{decision.get('confidence', 0)}%",
+            "quantity": decision.get("quantity", 0),
+            "entry_price": f"${decision.get('entry_price', 0)}",
+            "stop_loss": f"${decision.get('stop_loss', 0)}",
+            "take_profit": f"${decision.get('take_profit', 0)}",
+            "decision_process": reasoning.get("decision_process", "")
+        })
+        self.flush_report()
+    
+    def _get_default_decision(self) -> Dict:
+        """Return a neutral hold decision when generation fails"""
+        return dict(_DEFAULT_DECISION)
+    
+    def analyze_portfolio(self, portfolio: Dict[str, Dict], personality: str) -> Dict[str, Dict]:
+        """Generate trading decisions for several tickers concurrently
+        
+        portfolio maps each ticker to {"news_analysis": ..., "stock_data": ...}
+        """
+        return self.run_async(self.analyze_portfolio_async, portfolio, personality)
+    
+    async def analyze_portfolio_async(self, portfolio: Dict[str, Dict], personality: str,
+                                      session: aiohttp.ClientSession) -> Dict[str, Dict]:
+        """Fan out one trading decision per ticker and await them together"""
+        logger.info("\n📦 Generating trading decisions for %s tickers concurrently...", len(portfolio))
+        tickers = list(portfolio)
+        coros = [
+            self.generate_trading_decision_async(
+                ticker,
+                portfolio[ticker].get("news_analysis", {}),
+                portfolio[ticker].get("stock_data", {}),
+                personality,
+                session=session
+            )
+            for ticker in tickers
+        ]
+        decisions = await asyncio.gather(*coros)
+        return dict(zip(tickers, decisions))
     
     def analyze_content(self, scraped_data: Dict) -> Dict:
         """Analyze scraped content"""
@@ -534,29 +1423,9 @@ Provide your decision in JSON format with the following structure:
             content = scraped_data["content"]
             source = scraped_data["metadata"]["source"]
             
-            prompt = f"""Analyze this {source} content and provide:
-            1. A concise summary focused on market impact
-            2. The sentiment (bullish/bearish/neutral) with explanation
-            3. Three key insights that could affect trading decisions
+            prompt = _CONTENT_PROMPT_TMPL.format(source=source, content=content[:_MAX_CONTENT_CHARS])
             
-            Content: {content[:3000]}
-            
-            Respond in JSON format:
-            {{
-                "summary": "...",
-                "sentiment": {{
-                    "direction": "bullish/bearish/neutral",
-                    "explanation": "..."
-                }},
-                "key_points": [
-                    "point 1",
-                    "point 2",
-                    "point 3"
-                ],
-                "market_impact": "..."
-            }}"""
-            
-            analysis = json.loads(self._generate_response(prompt))
+            analysis = _loads(self.generate_response(prompt))
             return {
                 "success": True,
                 "summary": analysis["summary"],
@@ -566,134 +1435,256 @@ Provide your decision in JSON format with the following structure:
             }
             
         except Exception as e:
-            print(f"❌ Analysis failed: {str(e)}")
+            logger.exception("❌ Analysis failed: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
 
+    def analyze_contents(self, scraped_items: List[Dict]) -> List[Dict]:
+        """Analyze several scraped items concurrently, returning results in input order
+        
+        Each worker thread spends nearly all its time waiting on Ollama, so up to
+        OLLAMA_NUM_PARALLEL requests overlap despite the GIL.
+        """
+        results: List[Optional[Dict]] = [None] * len(scraped_items)
+        if not scraped_items:
+            return []
+        with ThreadPoolExecutor(max_workers=OLLAMA_NUM_PARALLEL) as executor:
+            futures = {
+                executor.submit(self.analyze_content, item): index
+                for index, item in enumerate(scraped_items)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
+    
     def generate_follow_up_questions(self, ticker: str, current_context: str) -> List[Dict]:
         """Generate targeted follow-up questions for a specific ticker"""
-        prompt = f"""Based on this context about {ticker}, generate 3 specific follow-up questions.
+        return self.run_async(self.generate_follow_up_questions_async, ticker, current_context)
+    
+    async def generate_follow_up_questions_async(self, ticker: str, current_context: str,
+                                                 session: aiohttp.ClientSession) -> List[Dict]:
+        """Async version of generate_follow_up_questions that shares the caller's HTTP session"""
+        prompt = _QUESTIONS_PROMPT_TMPL.format(ticker=ticker, context=current_context)
         
-        Context: {current_context}
+        try:
+            response = _loads(await self.generate_response_async(
+                prompt, session, system=_QUESTIONS_SYSTEM_PROMPT, format_schema=FOLLOW_UP_QUESTIONS_SCHEMA
+            ))
+        except JSONDecodeError as e:
+            logger.error("❌ Error generating questions: %s", e)
+            return self._get_default_questions(ticker)
         
-        Requirements:
-        1. Each question must be about {ticker} specifically
-        2. Focus on recent developments, financials, or competitive position
-        3. Questions should help with trading decisions
+        if not isinstance(response, dict):
+            logger.error("❌ Questions response for %s is not a JSON object", ticker)
+            return self._get_default_questions(ticker)
+        return self._validate_questions(response.get("questions", []), ticker)
+    
+    def generate_follow_up_questions_batch(self, pairs: List[Tuple[str, str]]) -> Dict[str, List[Dict]]:
+        """Generate follow-up questions for several (ticker, context) pairs with one LLM call"""
+        return self.run_async(self.generate_follow_up_questions_batch_async, pairs)
+    
+    async def generate_follow_up_questions_batch_async(self, pairs: List[Tuple[str, str]],
+                                                       session: aiohttp.ClientSession) -> Dict[str, List[Dict]]:
+        """Ask for every ticker's questions in one prompt so the model prefills and decodes once
         
-        Respond in JSON format:
-        {{
-            "questions": [
-                {{
-                    "text": "What is {ticker}'s...",
-                    "tool": "news_search/financial_data/market_analysis",
-                    "rationale": "This will help understand..."
-                }}
-            ]
-        }}"""
+        Batches whose contexts exceed the prompt budget are split into
+        sub-batches that run concurrently up to Ollama's parallel slots.
+        """
+        if not pairs:
+            return {}
         
-        try:
-            response = json.loads(self._generate_response(prompt))
-            questions = response.get("questions", [])
+        # Greedily pack pairs into sub-batches that each fit the budget
+        batches = [[]]
+        size = 0
+        for pair in pairs:
+            pair_size = len(pair[0]) + len(pair[1])
+            if batches[-1] and size + pair_size > _QUESTIONS_BATCH_CHAR_BUDGET:
+                batches.append([])
+                size = 0
+            batches[-1].append(pair)
+            size += pair_size
+        
+        if len(batches) == 1:
+            by_ticker = await self._generate_questions_sub_batch(pairs, session)
+        else:
+            logger.info("\n📦 Splitting questions for %s tickers into %s prompts...", len(pairs), len(batches))
+            semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
             
-            # Ensure each question has required fields
-            validated_questions = []
-            for q in questions:
-                if isinstance(q, dict):
-                    # Convert old format if needed
-                    if "question" in q and "text" not in q:
-                        q["text"] = q.pop("question")
-                    if "research_tool" in q and "tool" not in q:
-                        q["tool"] = q.pop("research_tool")
-                    
-                    # Validate required fields
-                    if "text" in q and "tool" in q and "rationale" in q:
-                        validated_questions.append(q)
+            async def run_batch(batch: List[Tuple[str, str]]) -> Dict[str, List]:
+                async with semaphore:
+                    return await self._generate_questions_sub_batch(batch, session)
             
-            if not validated_questions:
-                return self._get_default_questions(ticker)
+            by_ticker = {}
+            for result in await asyncio.gather(*(run_batch(batch) for batch in batches)):
+                by_ticker.update(result)
+        
+        # Tickers the model skipped fall back to the default questions
+        return {
+            ticker: self._validate_questions(by_ticker.get(ticker.strip().upper(), []), ticker)
+            for ticker, _ in pairs
+        }
+    
+    async def _generate_questions_sub_batch(self, pairs: List[Tuple[str, str]],
+                                            session: aiohttp.ClientSession) -> Dict[str, List]:
+        """Run one batched questions prompt, returning the raw questions keyed by upper-cased ticker"""
+        contexts = "\n\n".join(
+            f"{i}. Ticker: {ticker}\n   Context: {context}"
+            for i, (ticker, context) in enumerate(pairs, 1)
+        )
+        prompt = _QUESTIONS_BATCH_PROMPT_TMPL.format(count=len(pairs), contexts=contexts)
+        
+        by_ticker = {}
+        try:
+            response = _loads(await self.generate_response_async(
+                prompt, session, format_schema=FOLLOW_UP_QUESTIONS_BATCH_SCHEMA
+            ))
+        except JSONDecodeError as e:
+            logger.error("❌ Error generating batched questions: %s", e)
+            return by_ticker
+        
+        if not isinstance(response, dict):
+            logger.error("❌ Batched questions response is not a JSON object")
+            return by_ticker
+        for entry in response.get("results", []):
+            if isinstance(entry, dict):
+                by_ticker[str(entry.get("ticker", "")).strip().upper()] = entry.get("questions", [])
+        return by_ticker
+    
+    def _validate_questions(self, questions: List, ticker: str) -> List[Dict]:
+        """Keep well-formed questions, falling back to the defaults when none survive"""
+        # Ensure each question has required fields
+        validated_questions = []
+        for q in questions:
+            if isinstance(q, dict):
+                # Convert old format if needed
+                if "question" in q and "text" not in q:
+                    q["text"] = q.pop("question")
+                if "research_tool" in q and "tool" not in q:
+                    q["tool"] = q.pop("research_tool")
                 
-            return validated_questions
-            
-        except Exception as e:
-            print(f"❌ Error generating questions: {str(e)}")
+                # Validate required fields
+                if "text" in q and "tool" in q and "rationale" in q:
+                    validated_questions.append(q)
+        
+        if not validated_questions:
             return self._get_default_questions(ticker)
+            
+        return validated_questions
     
     def _get_default_questions(self, ticker: str) -> List[Dict]:
         """Return default questions when generation fails"""
+        values = {"ticker": ticker}
         return [
-            {
-                "text": f"What are {ticker}'s latest quarterly earnings results?",
-                "tool": "financial_data",
-                "rationale": "Understanding recent financial performance"
-            },
-            {
-                "text": f"What recent news has affected {ticker}'s stock price?",
-                "tool": "news_search",
-                "rationale": "Identifying price catalysts"
-            },
-            {
-                "text": f"How does {ticker}'s valuation compare to peers?",
-                "tool": "market_analysis",
-                "rationale": "Assessing relative value"
-            }
+            {**question, "text": question["text"].format_map(values)}
+            for question in _DEFAULT_QUESTIONS_TEMPLATE
         ]
     
     def select_trading_personality(self) -> str:
         """Select trading personality based on market conditions using chain-of-thought"""
-        print("\n👤 Starting Chain-of-Thought Personality Selection...")
+        return self.run_async(self.select_trading_personality_async)
+    
+    async def select_trading_personality_async(self, session: aiohttp.ClientSession) -> str:
+        """Async version of select_trading_personality that shares the caller's HTTP session"""
+        cached = AIAnalyzer._personality_cache
+        if cached is not None and time.monotonic() - cached[0] < self._personality_ttl:
+            logger.info("♻️ Using cached trading personality: %s", cached[1])
+            return cached[1]
         
-        prompt = """Analyze current market conditions and select the most appropriate trading personality.
-
-Think through the following steps:
-
-1. Assess market conditions:
-   - Volatility levels
-   - Trend strength
-   - Sector rotations
-   - Risk sentiment
-
-2. Consider trading styles:
-   - Conservative: Focus on capital preservation
-   - Moderate: Balanced risk/reward
-   - Aggressive: High risk/high reward
-   - Data-Driven: Quantitative approach
-   - News-Focused: Event-driven trading
-   - Trend-Following: Momentum-based
-   - Counter-Trend: Mean reversion
-   - Technical: Chart patterns
-   - Fundamental: Value-based
-
-3. Match conditions to personality:
-   - Which style is best suited?
-   - What are the pros and cons?
-   - How would each style perform?
-
-Provide your response in JSON format with:
-{
-    "personality": "selected personality",
-    "market_conditions": ["condition1", "condition2", ...],
-    "reasoning": "detailed explanation",
-    "expected_performance": "why this personality would work well"
-}"""
+        logger.info("\n👤 Starting Chain-of-Thought Personality Selection...")
         
-        response = self._generate_response(prompt)
+        prompt = _PERSONALITY_PROMPT
+        
+        # The TTL above decides when to re-ask, so skip the permanent response cache
+        response = await self.generate_response_async(
+            prompt, session, format_schema=PERSONALITY_SELECTION_SCHEMA, use_cache=False
+        )
         try:
-            result = json.loads(response)
-            
-            # Print personality selection process
-            print("\nPersonality Selection Process:")
-            self._print_analysis_step(1, "Market Conditions", {
-                "conditions": result.get("market_conditions", [])
-            })
-            self._print_analysis_step(2, "Selection Reasoning", {
-                "personality": result.get("personality", "Moderate"),
-                "reasoning": result.get("reasoning", ""),
-                "expected_performance": result.get("expected_performance", "")
-            })
-            
-            return result.get("personality", "Moderate")
-        except:
-            return "Moderate" 
\ No newline at end of file
+            result = _loads(response)
+        except JSONDecodeError as e:
+            logger.error("❌ Failed to parse personality selection: %s", e)
+            return "Moderate"
+        
+        if not isinstance(result, dict):
+            logger.error("❌ Personality selection is not a JSON object")
+            return "Moderate"
+        
+        self._print_personality_selection(result)
+        
+        personality = result.get("personality", "Moderate")
+        AIAnalyzer._personality_cache = (time.monotonic(), personality)
+        return personality
+    
+    def _print_personality_selection(self, result: Dict) -> None:
+        """Print the chain-of-thought steps of a personality selection"""
+        self._report("\nPersonality Selection Process:")
+        self._print_analysis_step(1, "Market Conditions", {
+            "conditions": result.get("market_conditions", [])
+        })
+        self._print_analysis_step(2, "Selection Reasoning", {
+            "personality": result.get("personality", "Moderate"),
+            "reasoning": result.get("reasoning", ""),
+            "expected_performance": result.get("expected_performance", "")
+        })
+        self.flush_report()
+    
+    def full_analysis(self, ticker: str, news_data: List[Dict],
+                      stock_data: Dict) -> Tuple[str, Dict, List[Dict], Dict]:
+        """Run personality selection, news analysis, follow-up questions and the trading decision in one LLM call"""
+        return self.run_async(self.full_analysis_async, ticker, news_data, stock_data)
+    
+    async def full_analysis_async(self, ticker: str, news_data: List[Dict], stock_data: Dict,
+                                  session: aiohttp.ClientSession) -> Tuple[str, Dict, List[Dict], Dict]:
+        """Fused version of the four analysis prompts
+        
+        The model sees the news and stock data once and answers every subtask in a
+        single JSON object, so one generation replaces four round trips. Returns
+        (personality, news_analysis, questions, decision).
+        """
+        logger.info("\n🧠 Starting Fused Analysis for %s...", ticker)
+        news_data = self._compact_news(news_data)
+        
+        prompt = _FULL_ANALYSIS_PROMPT_TMPL.format(
+            ticker=ticker,
+            news_json=await _dumps_async(news_data),
+            stock_json=await _dumps_async(stock_data)
+        )
+        
+        response = await self.generate_response_async(prompt, session, format_schema=FULL_ANALYSIS_SCHEMA)
+        try:
+            result = _loads(response) if response else {}
+        except JSONDecodeError as e:
+            logger.error("❌ Failed to parse fused analysis: %s", e)
+            result = {}
+        if not isinstance(result, dict):
+            result = {}
+        
+        selection = result.get("personality")
+        if isinstance(selection, dict):
+            self._print_personality_selection(selection)
+            personality = selection.get("personality", "Moderate")
+        else:
+            personality = "Moderate"
+        
+        news_analysis = result.get("news_analysis")
+        try:
+            news_analysis = self._normalize_news_analysis(news_analysis) if isinstance(news_analysis, dict) else None
+        except ValidationError as e:
+            logger.error("❌ Invalid news analysis in fused response: %s", e)
+            news_analysis = None
+        if news_analysis is not None:
+            self._print_news_analysis(news_analysis)
+        else:
+            news_analysis = self._get_default_analysis()
+        
+        questions = result.get("questions")
+        questions = self._validate_questions(questions if isinstance(questions, list) else [], ticker)
+        
+        decision = result.get("decision")
+        if isinstance(decision, dict):
+            self._print_trading_decision(decision)
+        else:
+            decision = self._get_default_decision()
+        
+        return personality, news_analysis, questions, decision
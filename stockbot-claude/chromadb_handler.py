@@ -1,51 +1,327 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import chromadb
 from chromadb.config import Settings
 import time
+import random
+import hashlib
+import os
+import atexit
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+import logging
+import warnings
 import requests
-from config import OLLAMA_EMBEDDING_URL, OLLAMA_EMBEDDING_MODEL
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import diskcache
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, Future
+from config import OLLAMA_URL, OLLAMA_EMBEDDING_URL, OLLAMA_EMBEDDING_MODEL, EMBED_BATCH_SIZE, EMBED_CACHE_DIR, CHROMA_EXPECTED_VECTORS
+from utils.json_utils import dumps_compact, loads, JSONDecodeError
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
+# Collections opened at startup, matching the MongoDB structure
+_STARTUP_COLLECTIONS = ("account", "news", "summary", "trades", "watchlist")
+
+# (connect, read) timeouts for embedding requests, so a hung Ollama can't stall ingestion
+_EMBED_TIMEOUT = (3, 60)
+
+# Most queued documents written by one collection.add call, and how long the
+# writer waits for more to arrive before writing a partial batch
+_ADD_BATCH_SIZE = 2048
+_ADD_BATCH_WAIT = 0.25
+
+# Documents read per page when backfilling saved_at on documents stored before it existed
+_BACKFILL_PAGE_SIZE = 5000
+
+# Seconds after a write during which the same text saved again to that collection is skipped
+_REPEAT_SAVE_WINDOW = 60.0
+
+def _with_timestamp(metadata: Optional[Dict]) -> Dict:
+    """Copy metadata and stamp it with the save time
+    
+    saved_at (epoch seconds) is numeric so Chroma can range-filter on it with
+    $gte/$lt; timestamp (ISO-8601) is kept for readability if the caller set none.
+    """
+    now = datetime.now()
+    stamped = dict(metadata or {})
+    stamped["saved_at"] = now.timestamp()
+    stamped.setdefault("timestamp", now.isoformat())
+    return stamped
+
+def _document_digest(document: str) -> bytes:
+    """Hash a serialized document for repeat-save detection"""
+    return hashlib.blake2b(document.encode(), digest_size=16).digest()
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    """Scale a vector, or each row of a matrix, to unit length"""
+    return vectors / (np.linalg.norm(vectors, axis=-1, keepdims=True) + 1e-12)
+
+def _int8_round_trip(vectors: np.ndarray) -> np.ndarray:
+    """Quantize each row to int8 with a per-row scale and return the float32 reconstruction q/127*scale
+    
+    Chroma stores float32, so the stored values keep the 8-bit resolution an
+    int8 index would hold and the collection can later move to one unchanged.
+    """
+    scale = np.abs(vectors).max(axis=-1, keepdims=True)
+    scale[scale == 0] = 1.0
+    q = np.round(vectors / scale * 127).astype(np.int8)
+    return q.astype(np.float32) / 127.0 * scale
+
+def _time_ordered_id() -> str:
+    """Unique id that sorts by creation time: 64-bit nanosecond clock then 64 random bits, in hex"""
+    return f"{time.time_ns():016x}{os.urandom(8).hex()}"
+
+def _decode_document(document: Optional[str]) -> Any:
+    """Decode a stored JSON document, returning plain text documents unchanged"""
+    if not document or document[0] not in "{[":
+        return document
+    try:
+        return loads(document)
+    except JSONDecodeError:
+        return document
+
+def _hnsw_params_for(n: int) -> Dict[str, Any]:
+    """HNSW index settings sized for a collection expected to hold about n vectors
+    
+    Larger graphs need more links per node (M) and wider candidate lists at
+    build and search time (construction_ef, search_ef) to keep recall up.
+    """
+    if n < 100_000:
+        m, construction_ef, search_ef = 16, 64, 40
+    elif n < 1_000_000:
+        m, construction_ef, search_ef = 24, 100, 100
+    else:
+        m, construction_ef, search_ef = 32, 128, 200
+    return {
+        "hnsw:space": "ip",  # Vectors are stored unit-length, so inner product ranks like cosine
+        "hnsw:M": m,
+        "hnsw:construction_ef": construction_ef,
+        "hnsw:search_ef": search_ef
+    }
+
 class ChromaDBHandler:
+    __slots__ = (
+        "client", "embedding_url", "embed_batch_url", "embedding_model", "headers",
+        "session", "_write_queue", "_writer", "collections", "_last_written", "_backfilled"
+    )
+    
+    # One handler per persist directory, shared by every component that stores documents
+    _shared: Dict[str, "ChromaDBHandler"] = {}
+    _shared_lock = threading.Lock()
+    
+    # LRU of float32 unit embeddings keyed by a hash of (model, text), shared by all handlers
+    _embedding_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+    _embedding_cache_lock = threading.Lock()
+    _embedding_cache_size = 4096
+    
+    # On-disk layer behind the LRU, holding float32 vector bytes; False if it could not be opened
+    _embedding_disk_cache = None
+    
+    @classmethod
+    def shared(cls, persist_directory: str = "chroma_db") -> "ChromaDBHandler":
+        """Return the process-wide handler for persist_directory, creating it on first use
+        
+        Each handler opens its own client, collection handles, HTTP pool and
+        writer thread, so components should share one rather than build their own.
+        """
+        with cls._shared_lock:
+            handler = cls._shared.get(persist_directory)
+            if handler is None:
+                handler = cls._shared[persist_directory] = cls(persist_directory)
+            return handler
+    
     def __init__(self, persist_directory: str = "chroma_db"):
         """Initialize ChromaDB with persistent storage"""
-        self.client = chromadb.Client(Settings(
-            persist_directory=persist_directory,
-            anonymized_telemetry=False
-        ))
+        self.client = chromadb.PersistentClient(
+            path=persist_directory,
+            settings=Settings(anonymized_telemetry=False)
+        )
+        self._enable_wal(persist_directory)
+        
+        # Ollama embedding endpoints: legacy one-text /api/embeddings and batched /api/embed
+        self.embedding_url = OLLAMA_EMBEDDING_URL or f"{OLLAMA_URL}/api/embeddings"
+        self.embed_batch_url = self.embedding_url.replace("/api/embeddings", "/api/embed")
+        self.embedding_model = OLLAMA_EMBEDDING_MODEL
+        self.headers = {
+            'Content-Type': 'application/json'
+        }
+        # One keep-alive connection pool shared by every embedding request, including pool threads.
+        # Embedding is idempotent, so POSTs are retried on connection errors and overload statuses too.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.25,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=None
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Saves are queued and written in batches by a background thread so callers don't wait on sqlite/HNSW
+        self._write_queue = queue.Queue(maxsize=10000)
+        self._writer = threading.Thread(target=self._drain_loop, name="chroma-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+        # Collection name -> (digest, monotonic time) of the last text document written; writer thread only
+        self._last_written: Dict[str, Tuple[bytes, float]] = {}
+        self._backfilled = set()  # Collections whose documents all carry saved_at
         
-        # Initialize collections to match MongoDB structure
+        # Initialize collections to match MongoDB structure: one listing, then create only what is missing
+        existing = {collection.name: collection for collection in self.client.list_collections()}
         self.collections = {
-            "account": self.client.get_or_create_collection("account"),
-            "news": self.client.get_or_create_collection("news"),
-            "summary": self.client.get_or_create_collection("summary"),
-            "trades": self.client.get_or_create_collection("trades"),
-            "watchlist": self.client.get_or_create_collection("watchlist")
+            name: existing.get(name) or self.client.create_collection(name)
+            for name in _STARTUP_COLLECTIONS
         }
         # print("✅ ChromaDB initialized with MongoDB-aligned collections")
     
-    def save_document(self, collection_name: str, document: Dict, metadata: Dict = None) -> bool:
-        """Save a document to specified collection"""
+    @staticmethod
+    def _enable_wal(persist_directory: str) -> None:
+        """Switch Chroma's sqlite store to write-ahead logging
+        
+        WAL lets readers proceed during writes and commits without rewriting
+        the main file. The journal mode is stored in the database file itself,
+        so it also applies to the connections Chroma opens.
+        """
+        try:
+            with sqlite3.connect(os.path.join(persist_directory, "chroma.sqlite3")) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not enable WAL on ChromaDB store: {str(e)}")
+
+    def _collection(self, name: str, create: bool = False):
+        """Return a collection handle, resolving it only on first use
+        
+        Handles are kept in self.collections. With create a missing collection
+        is created with HNSW settings sized for CHROMA_EXPECTED_VECTORS, the
+        corpus it is expected to grow to, because they are fixed at creation;
+        without it a missing collection raises like client.get_collection.
+        """
+        collection = self.collections.get(name)
+        if collection is not None:
+            return collection
+        try:
+            collection = self.client.get_collection(name=name)
+        except Exception:
+            if not create:
+                raise
+            collection = self.client.create_collection(name=name, metadata=_hnsw_params_for(CHROMA_EXPECTED_VECTORS))
+            print(f"✅ Created new collection {name}")
+        self.collections[name] = collection
+        return collection
+
+    def _drain_loop(self) -> None:
+        """Write queued documents, grouping everything that arrives together into one add per collection"""
+        while True:
+            items = [self._write_queue.get()]
+            deadline = time.monotonic() + _ADD_BATCH_WAIT
+            while len(items) < _ADD_BATCH_SIZE:
+                try:
+                    items.append(self._write_queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            
+            # One add per collection and per kind (with or without a precomputed embedding)
+            groups = {}
+            for collection, document, metadata, doc_id, embedding in items:
+                groups.setdefault((id(collection), embedding is None), (collection, []))[1].append(
+                    (document, metadata, doc_id, embedding)
+                )
+            for collection, group in groups.values():
+                digests = None
+                if group[0][3] is None:
+                    group, digests = self._drop_repeats(collection.name, group)
+                    if not group:
+                        continue
+                documents, metadatas, ids, embeddings = zip(*group)
+                try:
+                    collection.add(
+                        documents=list(documents),
+                        metadatas=list(metadatas),
+                        ids=list(ids),
+                        embeddings=None if embeddings[0] is None else [e.tolist() for e in embeddings]
+                    )
+                    logger.debug("✅ Wrote %s documents to %s", len(ids), collection.name)
+                except Exception as e:
+                    logger.error("❌ Failed to save %s documents to %s, dropping them: %s", len(ids), collection.name, e)
+                    continue
+                if digests:
+                    # Recorded only once the write succeeded, so a failed add never suppresses a retry
+                    self._last_written[collection.name] = (digests[-1], time.monotonic())
+            
+            for _ in items:
+                self._write_queue.task_done()
+
+    def _drop_repeats(self, collection_name: str, group: List[tuple]) -> Tuple[List[tuple], List[bytes]]:
+        """Drop text documents identical to the one saved just before them to the same collection
+        
+        Only back-to-back repeats are dropped, and the last document written counts
+        only within _REPEAT_SAVE_WINDOW seconds, so the same text saved again later
+        is stored again. Returns the kept items and their digests.
+        """
+        last_digest, written_at = self._last_written.get(collection_name, (None, 0.0))
+        if time.monotonic() - written_at > _REPEAT_SAVE_WINDOW:
+            last_digest = None
+        kept, digests = [], []
+        for item in group:
+            digest = _document_digest(item[0])
+            if digest != last_digest:
+                kept.append(item)
+                digests.append(digest)
+            last_digest = digest
+        if len(kept) < len(group):
+            logger.info("♻️ Skipped %s repeated documents for %s", len(group) - len(kept), collection_name)
+        return kept, digests
+
+    def flush(self) -> None:
+        """Block until every queued save has been written"""
+        self._write_queue.join()
+
+    def save_json_document(self, collection_name: str, payload: Dict, metadata: Dict = None) -> bool:
+        """Queue a dict for saving to the specified collection as compact JSON"""
+        return self._queue_document(collection_name, dumps_compact(payload), metadata)
+    
+    def save_text_document(self, collection_name: str, text: str, metadata: Dict = None) -> bool:
+        """Queue already-serialized or plain text for saving to the specified collection"""
+        return self._queue_document(collection_name, text, metadata)
+    
+    def save_document(self, collection_name: str, document: Any, metadata: Dict = None) -> bool:
+        """Deprecated: use save_json_document or save_text_document"""
+        warnings.warn(
+            "save_document is deprecated; use save_json_document or save_text_document",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        if isinstance(document, dict):
+            return self.save_json_document(collection_name, document, metadata)
+        return self.save_text_document(collection_name, str(document), metadata)
+    
+    def _queue_document(self, collection_name: str, doc_str: str, metadata: Optional[Dict]) -> bool:
+        """Queue a serialized document for the background writer
+        
+        Returns once the document is queued; call flush() to wait for the write.
+        """
         try:
             if collection_name not in self.collections:
                 print(f"❌ Invalid collection name: {collection_name}")
                 return False
-                
-            # Convert document to string if it's a dict
-            doc_str = json.dumps(document) if isinstance(document, dict) else str(document)
-            
-            # Generate a unique ID using collection name and timestamp
-            doc_id = f"{collection_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            
-            # Add the document
-            self.collections[collection_name].add(
-                documents=[doc_str],
-                metadatas=[metadata or {}],
-                ids=[doc_id]
-            )
             
-            print(f"✅ Saved document to {collection_name} with ID: {doc_id}")
+            # Generate a unique, time-ordered ID; a per-second timestamp collided when two saves shared a second
+            doc_id = f"{collection_name}_{_time_ordered_id()}"
+            
+            # Queue the document for the background writer
+            self._write_queue.put((self.collections[collection_name], doc_str, _with_timestamp(metadata), doc_id, None))
+            
+            print(f"✅ Queued document for {collection_name} with ID: {doc_id}")
             return True
             
         except Exception as e:
@@ -54,6 +330,7 @@ class ChromaDBHandler:
     
     def query_collection(self, collection_name: str, query_text: str, n_results: int = 5) -> List[Dict]:
         """Query documents from a collection"""
+        self.flush()  # Read queued saves too
         try:
             if collection_name not in self.collections:
                 print(f"❌ Invalid collection name: {collection_name}")
@@ -70,31 +347,200 @@ class ChromaDBHandler:
             print(f"❌ Failed to query {collection_name}: {str(e)}")
             return []
 
-    def get_embeddings(self, text: str) -> List[float]:
-        """Get embeddings from Ollama"""
+    def _embedding_key(self, text: str) -> bytes:
+        """Hash the embedding model and text into a compact cache key"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(self.embedding_model).encode())
+        digest.update(b"\0float32\0")  # Keeps float16 entries written by older versions from being read back
+        digest.update(text.encode())
+        return digest.digest()
+
+    @classmethod
+    def _get_embedding_disk_cache(cls) -> Optional[diskcache.Cache]:
+        """Return the on-disk embedding cache, or None when it is disabled or unavailable"""
+        if cls._embedding_disk_cache is None:
+            cls._embedding_disk_cache = False
+            if EMBED_CACHE_DIR:
+                try:
+                    cls._embedding_disk_cache = diskcache.Cache(EMBED_CACHE_DIR)
+                except Exception as e:
+                    print(f"⚠️ Failed to open embedding cache at {EMBED_CACHE_DIR}: {str(e)}")
+        return cls._embedding_disk_cache or None
+
+    def _cached_embedding(self, key: bytes) -> Optional[np.ndarray]:
+        """Return a cached embedding from memory, then disk, marking it most recently used
+        
+        Every tier holds the exact float32 vector Ollama returned, so a text embeds
+        identically whether it is cached or not.
+        """
+        with self._embedding_cache_lock:
+            embedding = self._embedding_cache.get(key)
+            if embedding is not None:
+                self._embedding_cache.move_to_end(key)
+                return embedding
+        
+        disk_cache = self._get_embedding_disk_cache()
+        if disk_cache is None:
+            return None
+        try:
+            blob = disk_cache.get(key)
+        except Exception as e:
+            print(f"⚠️ Failed to read embedding cache: {str(e)}")
+            return None
+        if blob is None:
+            return None
+        embedding = np.frombuffer(blob, dtype=np.float32)
+        self._remember_embedding(key, embedding, persist=False)
+        return embedding
+
+    def _remember_embedding(self, key: bytes, embedding: np.ndarray, persist: bool = True) -> None:
+        """Store an embedding in memory, evicting the least recently used one when full, and on disk"""
+        if persist:
+            disk_cache = self._get_embedding_disk_cache()
+            if disk_cache is not None:
+                try:
+                    disk_cache.set(key, embedding.astype(np.float32).tobytes())
+                except Exception as e:
+                    print(f"⚠️ Failed to write embedding cache: {str(e)}")
+        
+        # A read-only copy, so it neither pins a whole batch matrix nor changes under its callers
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.setflags(write=False)
+        with self._embedding_cache_lock:
+            self._embedding_cache[key] = embedding
+            self._embedding_cache.move_to_end(key)
+            while len(self._embedding_cache) > self._embedding_cache_size:
+                self._embedding_cache.popitem(last=False)
+
+    def get_recent_documents(self, collection_name: str, limit: int = 10,
+                             since: Optional[datetime] = None, days: int = 7) -> List[Dict]:
+        """Return the newest documents in a collection, newest first
+        
+        Reads through the metadata index with collection.get instead of a
+        similarity query, so no distances are computed. The read is always
+        bounded by a saved_at filter: since when given, otherwise the last
+        days days. JSON documents are returned decoded.
+        """
+        self.flush()  # Read queued saves too
+        try:
+            if collection_name not in self.collections:
+                print(f"❌ Invalid collection name: {collection_name}")
+                return []
+            
+            since = since or datetime.now() - timedelta(days=days)
+            results = self.collections[collection_name].get(
+                where={"saved_at": {"$gte": since.timestamp()}},
+                include=["documents", "metadatas"]
+            )
+            
+            documents = [
+                {"id": doc_id, "document": _decode_document(document), "metadata": metadata or {}}
+                for doc_id, document, metadata in zip(results["ids"], results["documents"], results["metadatas"])
+            ]
+            documents.sort(key=lambda doc: doc["metadata"].get("saved_at", 0), reverse=True)
+            return documents[:limit]
+            
+        except Exception as e:
+            print(f"❌ Failed to get recent documents from {collection_name}: {str(e)}")
+            return []
+
+    def delete_old_documents(self, collection_name: str, days_old: int = 30) -> int:
+        """Delete documents saved more than days_old days ago, returning how many were removed
+        
+        The cutoff is applied by Chroma as a where filter on saved_at, so no
+        documents are loaded or compared in Python. Documents stored before
+        saved_at existed get it backfilled first (see _backfill_saved_at).
+        """
+        self.flush()  # Include queued saves
         try:
-            print(f"\n🔄 Getting embedding for text: {text[:50]}...")
+            if collection_name not in self.collections:
+                print(f"❌ Invalid collection name: {collection_name}")
+                return 0
+            
+            collection = self.collections[collection_name]
+            self._backfill_saved_at(collection)
+            cutoff = (datetime.now() - timedelta(days=days_old)).timestamp()
+            before = collection.count()
+            collection.delete(where={"saved_at": {"$lt": cutoff}})
+            deleted = before - collection.count()
+            
+            print(f"✅ Deleted {deleted} documents older than {days_old} days from {collection_name}")
+            return deleted
             
-            response = requests.post(
+        except Exception as e:
+            print(f"❌ Failed to delete old documents from {collection_name}: {str(e)}")
+            return 0
+
+    def _backfill_saved_at(self, collection) -> None:
+        """Give documents that predate saved_at one, parsed from their ISO timestamp metadata
+        
+        Chroma's where filters cannot match a missing key or compare strings, so
+        these documents would never be pruned. Runs once per collection per handler,
+        reading metadata only, a page at a time. Documents whose timestamp cannot be
+        parsed are stamped with the current time and age out from now.
+        """
+        if collection.name in self._backfilled:
+            return
+        offset = 0
+        backfilled = 0
+        while True:
+            page = collection.get(include=["metadatas"], limit=_BACKFILL_PAGE_SIZE, offset=offset)
+            if not page["ids"]:
+                break
+            ids, metadatas = [], []
+            for doc_id, metadata in zip(page["ids"], page["metadatas"]):
+                metadata = metadata or {}
+                if "saved_at" in metadata:
+                    continue
+                try:
+                    saved_at = datetime.fromisoformat(str(metadata.get("timestamp"))).timestamp()
+                except ValueError:
+                    saved_at = datetime.now().timestamp()
+                ids.append(doc_id)
+                metadatas.append({**metadata, "saved_at": saved_at})
+            if ids:
+                collection.update(ids=ids, metadatas=metadatas)
+                backfilled += len(ids)
+            offset += len(page["ids"])
+        if backfilled:
+            logger.info("🕒 Backfilled saved_at on %s documents in %s", backfilled, collection.name)
+        self._backfilled.add(collection.name)
+
+    def get_embeddings(self, text: str) -> np.ndarray:
+        """Get a float32 embedding from Ollama, reusing the cached vector for text seen before"""
+        key = self._embedding_key(text)
+        embedding = self._cached_embedding(key)
+        if embedding is None:
+            embedding = self._request_embedding(text)
+            self._remember_embedding(key, embedding)
+        return embedding
+
+    def _request_embedding(self, text: str) -> np.ndarray:
+        """Get one embedding from Ollama's /api/embeddings"""
+        try:
+            logger.debug("🔄 Getting embedding for text: %s...", text[:50])
+            
+            response = self.session.post(
                 self.embedding_url,
-                headers=self.headers,
                 json={
                     "model": self.embedding_model,
                     "prompt": text
-                }
+                },
+                timeout=_EMBED_TIMEOUT
             )
             response.raise_for_status()
             
-            # Debug response
-            print(f"Response status: {response.status_code}")
-            print(f"Response keys: {response.json().keys()}")
+            # Parse the body once, with the fast JSON backend
+            data = loads(response.content)
+            logger.debug("Response status: %s, keys: %s", response.status_code, list(data))
             
-            # Handle both 'embedding' and 'embeddings' keys
-            data = response.json()
+            # Handle both 'embedding' and 'embeddings' keys; keep 4-byte floats rather than Python objects,
+            # normalized so similarity search needs only a dot product
             if 'embedding' in data:
-                return data['embedding']
+                return _unit(np.asarray(data['embedding'], dtype=np.float32))
             elif 'embeddings' in data:
-                return data['embeddings']
+                embedding = np.asarray(data['embeddings'], dtype=np.float32)
+                return _unit(embedding[0] if embedding.ndim == 2 else embedding)
             else:
                 raise ValueError(f"No embedding found in response: {data}")
             
@@ -102,42 +548,93 @@ class ChromaDBHandler:
             print(f"❌ Error getting embedding: {str(e)}")
             raise
 
+    def get_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """Get a (len(texts), dim) float32 array of embeddings from Ollama's /api/embed, EMBED_BATCH_SIZE texts per request
+        
+        Cached texts are not re-sent. Falls back to one /api/embeddings call
+        per text if the server does not return an 'embeddings' list (older
+        Ollama versions).
+        """
+        keys = [self._embedding_key(text) for text in texts]
+        found = {}
+        missing = {}  # Uncached texts by key, each sent once even if repeated
+        for key, text in zip(keys, texts):
+            if key in found or key in missing:
+                continue
+            embedding = self._cached_embedding(key)
+            if embedding is None:
+                missing[key] = text
+            else:
+                found[key] = embedding
+        
+        missing_keys = list(missing)
+        missing_texts = list(missing.values())
+        for start in range(0, len(missing_texts), EMBED_BATCH_SIZE):
+            batch = missing_texts[start:start + EMBED_BATCH_SIZE]
+            response = self.session.post(
+                self.embed_batch_url,
+                json={
+                    "model": self.embedding_model,
+                    "input": batch
+                },
+                timeout=_EMBED_TIMEOUT
+            )
+            data = loads(response.content) if response.ok else {}
+            batch_embeddings = data.get("embeddings")
+            if not isinstance(batch_embeddings, list) or len(batch_embeddings) != len(batch):
+                print("⚠️ Batch embedding unavailable, embedding texts one at a time")
+                batch_embeddings = [future.result() for future in self._submit_embeddings(batch)]
+            batch_embeddings = _unit(np.asarray(batch_embeddings, dtype=np.float32))
+            for key, embedding in zip(missing_keys[start:start + EMBED_BATCH_SIZE], batch_embeddings):
+                self._remember_embedding(key, embedding)
+                found[key] = embedding
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def _submit_embeddings(self, texts: List[str]) -> List[Future]:
+        """Start one /api/embeddings call per text on a bounded thread pool; futures are in input order"""
+        def embed(text: str) -> np.ndarray:
+            time.sleep(random.uniform(0, 0.05))  # Stagger the first requests so they don't all land at once
+            return self.get_embeddings(text)
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(texts)) or 1) as pool:
+            return [pool.submit(embed, text) for text in texts]
+
     def process_chunks(self, chunks: List[str]) -> Dict:
         """Process text chunks and store in ChromaDB"""
         try:
             print(f"\n🔄 Processing {len(chunks)} chunks...")
             collection_name = "article_embeddings"
             
-            # Get or create collection
-            try:
-                collection = self.client.get_collection(name=collection_name)
-                print("✅ Got existing collection")
-            except:
-                collection = self.client.create_collection(
-                    name=collection_name,
-                    metadata={"hnsw:space": "cosine"}
-                )
-                print("✅ Created new collection")
+            collection = self._collection(collection_name, create=True)
 
-            # Generate embeddings
-            embeddings_list = []
-            for i, chunk in enumerate(chunks):
-                try:
-                    embedding = self.get_embeddings(chunk)
-                    embeddings_list.append(embedding)
-                    print(f"✅ Chunk {i+1}/{len(chunks)} embedded")
-                except Exception as e:
-                    print(f"❌ Error processing chunk {i+1}: {str(e)}")
-                    continue
+            # Generate embeddings, batched; chunks that fail are dropped together with their text
+            embedded_chunks = chunks
+            try:
+                embeddings_list = self.get_embeddings_batch(chunks)
+                print(f"✅ Embedded {len(chunks)} chunks")
+            except Exception as e:
+                print(f"⚠️ Batch embedding failed, retrying chunks individually: {str(e)}")
+                embedded_chunks = []
+                embeddings_list = []
+                for i, (chunk, future) in enumerate(zip(chunks, self._submit_embeddings(chunks))):
+                    try:
+                        embeddings_list.append(future.result())
+                        embedded_chunks.append(chunk)
+                        logger.debug("✅ Chunk %s/%s embedded", i + 1, len(chunks))
+                    except Exception as e:
+                        print(f"❌ Error processing chunk {i+1}: {str(e)}")
+                        continue
 
-            # Add to ChromaDB
-            if embeddings_list:
-                collection.add(
-                    embeddings=embeddings_list,
-                    documents=chunks,
-                    ids=[f"doc_{int(time.time())}_{i}" for i in range(len(embeddings_list))]
-                )
-                print(f"✅ Added {len(embeddings_list)} embeddings to ChromaDB")
+            # Queue for the background writer, which adds them in bounded batches; Chroma's
+            # validation only accepts plain lists, so vectors are converted there. Stored vectors
+            # are int8-quantized; the cache and query embeddings stay full float32.
+            if len(embeddings_list):
+                stored_embeddings = _int8_round_trip(np.asarray(embeddings_list, dtype=np.float32))
+                for chunk, embedding in zip(embedded_chunks, stored_embeddings):
+                    self._write_queue.put((collection, chunk, _with_timestamp(None), f"doc_{_time_ordered_id()}", embedding))
+                print(f"✅ Queued {len(embeddings_list)} embeddings for ChromaDB")
             
             return {
                 "success": True,
@@ -153,14 +650,18 @@ class ChromaDBHandler:
             }
 
     def query_similar(self, query: str, collection_name: str = "article_embeddings", n_results: int = 3) -> List[str]:
-        """Query similar documents"""
+        """Query similar documents
+        
+        Recall is governed by the collection's hnsw:search_ef, set when it is created.
+        """
+        self.flush()  # Read queued saves too
         try:
             print(f"\n🔍 Querying similar documents for: {query[:50]}...")
-            collection = self.client.get_collection(name=collection_name)
+            collection = self._collection(collection_name)
             
             query_embedding = self.get_embeddings(query)
             results = collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=[query_embedding.tolist()],
                 n_results=n_results
             )
             
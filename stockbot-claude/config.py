@@ -9,10 +9,41 @@ MONGODB_URI = os.getenv("MONGODB_URI")
 OLLAMA_URL = os.getenv("OLLAMA_URL")
 OLLAMA_API_KEY = os.getenv("OLLAMA_API_KEY")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL")
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))  # Concurrent requests sent to Ollama
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # How long Ollama keeps the model and its KV cache loaded
 OLLAMA_EMBEDDING_URL = os.getenv("OLLAMA_EMBEDDING_URL")
 OLLAMA_EMBEDDING_MODEL = os.getenv("OLLAMA_EMBEDDING_MODEL")
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))  # Texts sent per /api/embed request
 SEARXNG_URL = os.getenv("SEARXNG_URL")
 
+# News batches up to this many characters of JSON are analyzed in one prompt instead of in chunks
+NEWS_PROMPT_CHAR_BUDGET = int(os.getenv("NEWS_PROMPT_CHAR_BUDGET", "24000"))
+
+# On-disk LLM response cache; set LLM_CACHE_DIR to an empty string to disable it
+LLM_CACHE_DIR = os.path.expanduser(os.getenv("LLM_CACHE_DIR", "~/.stockbuddy/llm_cache"))
+
+# Vectors the article embedding collection is expected to grow to; picks its HNSW settings when it is
+# first created, since they cannot change afterwards
+CHROMA_EXPECTED_VECTORS = int(os.getenv("CHROMA_EXPECTED_VECTORS", "100000"))
+
+# On-disk embedding cache (float32 vectors); set EMBED_CACHE_DIR to an empty string to disable it
+EMBED_CACHE_DIR = os.path.expanduser(os.getenv("EMBED_CACHE_DIR", "~/.stockbuddy/embed_cache"))
+
+# On-disk ticker validation cache; valid tickers are trusted for TICKER_CACHE_TTL seconds
+TICKER_CACHE_DIR = os.path.expanduser(os.getenv("TICKER_CACHE_DIR", "~/.stockbuddy/ticker_cache"))
+TICKER_CACHE_TTL = int(os.getenv("TICKER_CACHE_TTL", "86400"))
+
+# On-disk cache of scraped pages by URL, so re-searched articles skip the browser for SCRAPE_CACHE_TTL seconds
+SCRAPE_CACHE_DIR = os.path.expanduser(os.getenv("SCRAPE_CACHE_DIR", "~/.stockbuddy/scrape_cache"))
+SCRAPE_CACHE_TTL = int(os.getenv("SCRAPE_CACHE_TTL", "21600"))
+
+# General mode deep-analyzes at most MAX_STOCK_ANALYSES watchlist tickers per run, starting no new
+# analyses after STOCK_ANALYSIS_DEADLINE seconds. Tickers analyzed within the last
+# STOCK_ANALYSIS_FRESH_HOURS hours reuse their stored result instead.
+MAX_STOCK_ANALYSES = int(os.getenv("MAX_STOCK_ANALYSES", "25"))
+STOCK_ANALYSIS_DEADLINE = float(os.getenv("STOCK_ANALYSIS_DEADLINE", "300"))
+STOCK_ANALYSIS_FRESH_HOURS = float(os.getenv("STOCK_ANALYSIS_FRESH_HOURS", "6"))
+
 # Trading settings
 INITIAL_BALANCE = 1000000  # Paper trading initial balance
 MAX_POSITIONS = 10  # Maximum number of concurrent positions
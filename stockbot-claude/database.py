@@ -1,17 +1,37 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne, ASCENDING, DESCENDING
 from datetime import datetime
 from config import MONGODB_URI, DB_NAME, COLLECTIONS
-from typing import List
+from typing import Dict, List, Optional
+
+# Fields returned by default from list queries; large payloads such as the
+# stored analysis and article body are only sent when a caller asks for them
+_OPEN_POSITION_FIELDS = {
+    "ticker": 1, "action": 1, "price": 1, "quantity": 1,
+    "stop_loss": 1, "take_profit": 1, "status": 1, "timestamp": 1
+}
+_RECENT_NEWS_FIELDS = {"ticker": 1, "source": 1, "timestamp": 1}
 
 class DatabaseHandler:
     def __init__(self):
         self.client = MongoClient(MONGODB_URI)
         self.db = self.client[DB_NAME]
+        self._ensure_indexes()
     
-    def save_trade(self, ticker, action, price, quantity, personality, confidence, stop_loss, take_profit, analysis=None):
-        """Save trade decision to database"""
-        collection = self.db[COLLECTIONS["trades"]]
-        trade = {
+    def _ensure_indexes(self) -> None:
+        """Create the indexes behind the open-position, recent-news, news-fingerprint, watchlist and recent-summary lookups"""
+        try:
+            self.db[COLLECTIONS["trades"]].create_index([("status", ASCENDING), ("timestamp", DESCENDING)])
+            self.db[COLLECTIONS["news"]].create_index([("ticker", ASCENDING), ("timestamp", DESCENDING)])
+            self.db[COLLECTIONS["news"]].create_index("news_data.fingerprint", sparse=True)
+            self.db[COLLECTIONS["news"]].create_index("news_data.url", sparse=True)
+            self.db["watchlist"].create_index("sector", unique=True)
+            self.db[COLLECTIONS["summary"]].create_index([("mode", ASCENDING), ("timestamp", DESCENDING)])
+        except Exception as e:
+            print(f"Error creating indexes: {str(e)}")
+    
+    def _trade_document(self, ticker, action, price, quantity, personality, confidence, stop_loss, take_profit, analysis=None) -> Dict:
+        """Build the stored form of a trade decision"""
+        return {
             "ticker": ticker,
             "action": action,
             "price": price,
@@ -24,8 +44,24 @@ class DatabaseHandler:
             "status": "open",
             "analysis": analysis or {}  # Include analysis data if provided
         }
+    
+    def save_trade(self, ticker, action, price, quantity, personality, confidence, stop_loss, take_profit, analysis=None):
+        """Save trade decision to database"""
+        collection = self.db[COLLECTIONS["trades"]]
+        trade = self._trade_document(ticker, action, price, quantity, personality, confidence, stop_loss, take_profit, analysis)
         return collection.insert_one(trade)
     
+    def save_trades_bulk(self, trades: List[Dict]):
+        """Save several trade decisions in one round trip
+        
+        Each item holds the keyword arguments of save_trade. Inserts are
+        unordered so the server can apply them in parallel.
+        """
+        if not trades:
+            return None
+        collection = self.db[COLLECTIONS["trades"]]
+        return collection.insert_many([self._trade_document(**trade) for trade in trades], ordered=False)
+    
     def save_news(self, ticker, news_data, source):
         """Save news data to database"""
         collection = self.db[COLLECTIONS["news"]]
@@ -37,24 +73,80 @@ class DatabaseHandler:
         }
         return collection.insert_one(news_entry)
     
+    def save_news_bulk(self, ticker, articles: List[Dict]):
+        """Save several news articles for one ticker in one round trip"""
+        if not articles:
+            return None
+        collection = self.db[COLLECTIONS["news"]]
+        now = datetime.now()
+        return collection.insert_many([
+            {
+                "ticker": ticker,
+                "news_data": article,
+                "source": article.get("source", "unknown"),
+                "timestamp": now
+            }
+            for article in articles
+        ], ordered=False)
+    
+    def get_news_by_fingerprint(self, fingerprint: str) -> Optional[Dict]:
+        """Get the most recently stored article with the given content fingerprint, if any"""
+        try:
+            collection = self.db[COLLECTIONS["news"]]
+            entry = collection.find_one(
+                {"news_data.fingerprint": fingerprint},
+                projection={"news_data": 1},
+                sort=[("timestamp", DESCENDING)]
+            )
+            return entry["news_data"] if entry else None
+        except Exception as e:
+            print(f"Error looking up news fingerprint: {str(e)}")
+            return None
+    
+    def get_recent_news_by_url(self, urls: List[str], since: datetime) -> Dict[str, Dict]:
+        """Get the latest article stored since the given time for each URL, keyed by URL"""
+        try:
+            collection = self.db[COLLECTIONS["news"]]
+            articles = {}
+            for entry in collection.find(
+                {"news_data.url": {"$in": urls}, "timestamp": {"$gte": since}},
+                projection={"news_data": 1},
+                sort=[("timestamp", DESCENDING)]
+            ):
+                articles.setdefault(entry["news_data"]["url"], entry["news_data"])
+            return articles
+        except Exception as e:
+            print(f"Error looking up recent news: {str(e)}")
+            return {}
+    
     def update_watchlist(self, tickers: List[str], sector: str) -> None:
         """Update watchlist with new tickers for a sector"""
+        self.update_watchlists({sector: tickers})
+    
+    def update_watchlists(self, sector_tickers: Dict[str, List[str]]) -> None:
+        """Update the watchlists of several sectors in one bulk write"""
+        if not sector_tickers:
+            return
         try:
             # Get the watchlist collection
             collection = self.db["watchlist"]
             
-            # Update or insert the sector document
-            collection.update_one(
-                {"sector": sector},
-                {
-                    "$set": {
-                        "sector": sector,
-                        "tickers": tickers,
-                        "last_updated": str(datetime.now())
-                    }
-                },
-                upsert=True
-            )
+            # Update or insert each sector document
+            last_updated = str(datetime.now())
+            collection.bulk_write([
+                UpdateOne(
+                    {"sector": sector},
+                    {
+                        "$set": {
+                            "sector": sector,
+                            "tickers": tickers,
+                            "last_updated": last_updated
+                        }
+                    },
+                    upsert=True
+                )
+                for sector, tickers in sector_tickers.items()
+            ], ordered=False)
         except Exception as e:
             print(f"Error updating watchlist: {str(e)}")
             
@@ -89,16 +181,47 @@ class DatabaseHandler:
         }
         return collection.insert_one(summary)
     
-    def get_open_positions(self):
-        """Get all open trading positions"""
+    def get_recent_stock_summaries(self, tickers: List[str], since: datetime) -> Dict[str, Dict]:
+        """Get the latest single-stock decision and summary saved since the given time for each ticker"""
+        if not tickers:
+            return {}
+        try:
+            collection = self.db[COLLECTIONS["summary"]]
+            cursor = collection.find(
+                {"mode": "single_stock", "actions_taken.ticker": {"$in": tickers}, "timestamp": {"$gte": since}},
+                projection={"actions_taken": 1, "performance_metrics": 1, "timestamp": 1}
+            ).sort("timestamp", DESCENDING)
+            
+            wanted = set(tickers)
+            latest = {}
+            for doc in cursor:
+                for decision in doc.get("actions_taken", []):
+                    ticker = decision.get("ticker") if isinstance(decision, dict) else None
+                    if ticker in wanted and ticker not in latest:
+                        latest[ticker] = {
+                            "decision": decision,
+                            "summary": doc.get("performance_metrics", {}),
+                            "timestamp": doc["timestamp"]
+                        }
+                if len(latest) == len(wanted):
+                    break
+            return latest
+        except Exception as e:
+            print(f"Error getting recent stock summaries: {str(e)}")
+            return {}
+    
+    def get_open_positions(self, fields: Optional[Dict] = None):
+        """Get all open trading positions, with only the given fields (default: the position summary)"""
         collection = self.db[COLLECTIONS["trades"]]
-        return list(collection.find({"status": "open"}))
+        cursor = collection.find({"status": "open"}, projection=fields or _OPEN_POSITION_FIELDS)
+        return list(cursor.batch_size(200))
     
-    def get_recent_news(self, ticker=None, limit=50):
-        """Get recent news entries"""
+    def get_recent_news(self, ticker=None, limit=50, fields: Optional[Dict] = None):
+        """Get recent news entries, with only the given fields (default: ticker, source and timestamp)"""
         collection = self.db[COLLECTIONS["news"]]
         query = {} if ticker is None else {"ticker": ticker}
-        return list(collection.find(query).sort("timestamp", -1).limit(limit))
+        cursor = collection.find(query, projection=fields or _RECENT_NEWS_FIELDS)
+        return list(cursor.sort("timestamp", -1).limit(limit).batch_size(200))
     
     def close_position(self, trade_id, exit_price):
         """Close a trading position"""
@@ -1,62 +1,32 @@
-from typing import Dict, List
-from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 from news_search import NewsSearcher
 from ai_analysis import AIAnalyzer
-from stock_data import StockDataHandler
+from stock_data import StockDataHandler, normalize_ticker
 from database import DatabaseHandler
 from sector_mode import SectorMode
 from single_stock_mode import SingleStockMode
 from web_scraper import WebScraper
 from utils.console_colors import console
-import json
+from config import MAX_STOCK_ANALYSES, STOCK_ANALYSIS_DEADLINE, STOCK_ANALYSIS_FRESH_HOURS
+from schemas import ARTICLE_ANALYSIS_SCHEMA
+import asyncio
+import aiohttp
+import hashlib
+from collections import Counter
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed, TimeoutError as FuturesTimeoutError
+import logging
+from utils.json_utils import dumps_compact, loads, repair_json, JSONDecodeError
+from utils.content import extract_relevant
+from utils.urls import normalize_url
 
-class GeneralMode:
-    def __init__(self):
-        print(f"\n{console.title('=== Initializing General Market Mode ===')}")
-        self.news_searcher = NewsSearcher()
-        self.ai_analyzer = AIAnalyzer()
-        self.stock_data = StockDataHandler()
-        self.db = DatabaseHandler()
-        self.sector_mode = SectorMode()
-        self.single_stock_mode = SingleStockMode()
-        self.web_scraper = WebScraper()
-        print(f"{console.success('✅ General Market Mode initialized')}")
-    
-    def run(self) -> Dict:
-        """Run general mode trading analysis with enhanced flow"""
-        try:
-            print(f"\n{console.title('🌎 Starting General Market Analysis')}")
-            
-            # Step 1: Get and analyze recent market news
-            print(f"\n{console.title('📰 Step 1: Fetching today market news...')}")
-            news_urls = self.news_searcher.search_market_news("today's stock market news last 24 hours")
-            print(f"{console.info(f'Found {console.metric(str(len(news_urls)))} news articles')}")
-            
-            # Step 2: Scrape and analyze each news article
-            print(f"\n{console.title('🔍 Step 2: Scraping and analyzing news articles...')}")
-            market_news = []
-            for url_data in news_urls:
-                url = url_data.get('url')
-                if not url:
-                    continue
-                    
-                try:
-                    print(f"\n{console.info(f'📄 Scraping article from: {url}')}")
-                    scraped_data = self.web_scraper.scrape_and_analyze(url)
-                    
-                    if not scraped_data.get("success"):
-                        continue
-                        
-                    print(f"\n{console.highlight('📝 Generating article analysis...')}")
-                    
-                    # Create prompt for content analysis
-                    process_prompt = f"""Analyze this financial news article and extract key information:
-
-Content:
-{scraped_data.get('content')}
+_MAX_ARTICLE_PROMPT_CHARS = 4000  # Article text sent to the LLM; the rest is mostly boilerplate
 
-Source: {scraped_data.get('metadata', {}).get('source', 'unknown')}
-URL: {url}
+# Shared by every article so identical articles produce identical prompts and hit the LLM response cache.
+# The instructions and example are a fixed prefix built once, with the article appended last, so every
+# prompt shares a long common prefix the server can reuse from its prompt cache.
+_ARTICLE_ANALYSIS_PREFIX = """Analyze the financial news article below and extract key information.
 
 Please provide a structured analysis with the following information:
 - A brief 2-3 sentence summary
@@ -68,7 +38,7 @@ Please provide a structured analysis with the following information:
 - Sector implications
 
 Format your response as valid JSON like this:
-{{
+{
     "summary": "your summary here",
     "sentiment": "bullish/bearish/neutral",
     "confidence": 85,
@@ -78,118 +48,123 @@ Format your response as valid JSON like this:
     ],
     "market_impact": "description here",
     "mentioned_tickers": [
-        {{"ticker": "AAPL", "sector": "TECHNOLOGY"}},
-        {{"ticker": "MSFT", "sector": "TECHNOLOGY"}}
+        {"ticker": "AAPL", "sector": "TECHNOLOGY"},
+        {"ticker": "MSFT", "sector": "TECHNOLOGY"}
     ],
     "sector_implications": [
         "implication 1",
         "implication 2"
     ]
-}}"""
-                    
-                    # Get analysis from LLM
-                    analysis_content = self.ai_analyzer._generate_response(process_prompt)
-                    
-                    # Clean up JSON
-                    analysis_content = analysis_content.replace(",}", "}")
-                    analysis_content = analysis_content.replace(",]", "]")
-                    
-                    try:
-                        analysis_data = json.loads(analysis_content)
-                        
-                        # Add metadata
-                        analysis_data["source"] = scraped_data.get("metadata", {}).get("source", "unknown")
-                        analysis_data["url"] = url
-                        analysis_data["timestamp"] = str(datetime.now())
-                        
-                        # Save both scraped content and analysis
-                        self._save_news(scraped_data, analysis_data)
-                        
-                        # Add to market news for further analysis
-                        market_news.append({
-                            "content": scraped_data,
-                            "analysis": analysis_data
-                        })
-                        
-                        source = analysis_data["source"]
-                        sentiment = analysis_data["sentiment"]
-                        confidence = str(analysis_data["confidence"])
-                        key_points_count = str(len(analysis_data["key_points"]))
-                        
-                        print(f"\n{console.success('✅ Successfully processed article from ' + source)}")
-                        print(f"{console.info('📊 Sentiment: ' + console.highlight(sentiment) + f' ({console.metric(confidence)}% confidence)')}")
-                        print(f"{console.info('📝 Key Points: ' + console.metric(key_points_count))}")
-                        
-                        if analysis_data.get('mentioned_tickers'):
-                            tickers_str = ', '.join(console.ticker(t['ticker']) for t in analysis_data['mentioned_tickers'])
-                            print(f"{console.info('🎯 Found tickers: ' + tickers_str)}")
-                            
-                    except json.JSONDecodeError as e:
-                        print(f"{console.error('⚠️ JSON parsing error: ' + str(e))}")
-                        print(f"{console.warning('Raw content:')} {analysis_content}")
-                        continue
-                        
-                except Exception as e:
-                    print(f"{console.error('⚠️ Error processing article: ' + str(e))}")
-                    continue
+}"""
+
+def _article_analysis_prompt(content: str, source: str, url: str) -> str:
+    """Append one article's details to the shared analysis instructions"""
+    return f"{_ARTICLE_ANALYSIS_PREFIX}\n\nSource: {source}\nURL: {url}\n\nContent:\n{content}"
+
+def _safe_parse_llm_json(text: str) -> Dict:
+    """Parse an LLM JSON response, repairing trailing or missing commas in one pass if needed
+    
+    Article prompts are schema-constrained, so the repair pass only runs for servers
+    that ignore the format field. Raises JSONDecodeError when the text is still invalid.
+    """
+    try:
+        return loads(text)
+    except JSONDecodeError:
+        return loads(repair_json(text))
+
+logger = logging.getLogger(__name__)
+
+# Ticker-shaped words the LLM picks out of news text that are not useful tickers
+_NOT_TICKERS = frozenset({"I", "THE", "CEO", "USD", "GDP", "FED", "NA", "NONE"})
+
+# Relevance ratings from the sector/ticker extraction prompt that are kept
+_RELEVANT = frozenset({"high", "medium"})
+
+def _content_fingerprint(content: str) -> str:
+    """Hash the start of an article's content so copies under different URLs match"""
+    return hashlib.blake2b(content[:4096].encode(), digest_size=8).hexdigest()
+
+class GeneralMode:
+    _WRITE_BATCH_SIZE = 16  # Analyzed articles saved per bulk write during news processing
+    _WRITE_BATCH_WAIT = 0.5  # Seconds a partial batch waits for more articles before it is saved
+    _ANALYSIS_BATCH_SIZE = 16  # Scraped articles whose analysis prompts are submitted together
+    _ANALYSIS_BATCH_WAIT = 0.5  # Seconds a batch collects scraped articles before its prompts are sent
+    _MAX_PARALLEL_RUNS = 8  # Sector or single-stock analyses run at once
+    _RECENT_NEWS_HOURS = 24  # Articles saved this recently are reused by URL instead of scraped again
+    
+    def __init__(self):
+        logger.info("\n%s", console.title('=== Initializing General Market Mode ==='))
+        self.news_searcher = NewsSearcher()
+        self.ai_analyzer = AIAnalyzer()
+        self.stock_data = StockDataHandler()
+        self.db = DatabaseHandler()
+        self.sector_mode = SectorMode()
+        self.single_stock_mode = SingleStockMode()
+        self.web_scraper = WebScraper()
+        self._validation_cache: Dict[str, bool] = {}  # Ticker validity, reset at the start of each run
+        logger.info("%s", console.success('✅ General Market Mode initialized'))
+    
+    def run(self) -> Dict:
+        """Run general mode trading analysis with enhanced flow"""
+        try:
+            logger.info("\n%s", console.title('🌎 Starting General Market Analysis'))
+            self._validation_cache.clear()
+            
+            # Step 1: Get and analyze recent market news
+            logger.info("\n%s", console.title('📰 Step 1: Fetching today market news...'))
+            news_urls = self.news_searcher.search_market_news("today's stock market news last 24 hours")
+            logger.info("%s", console.info(f'Found {console.metric(str(len(news_urls)))} news articles'))
+            
+            # Step 2: Scrape and analyze each news article
+            logger.info("\n%s", console.title('🔍 Step 2: Scraping and analyzing news articles...'))
+            market_news = self.ai_analyzer.run_async(self._process_articles, news_urls)
             
             processed_count = str(len(market_news))
-            print(f"\n{console.success('✅ Successfully processed ' + console.metric(processed_count) + ' articles')}")
+            logger.info("\n%s", console.success('✅ Successfully processed ' + console.metric(processed_count) + ' articles'))
             
             # Step 3: Deep analysis of market news
-            print(f"\n{console.title('🔍 Step 3: Starting deep market analysis...')}")
+            logger.info("\n%s", console.title('🔍 Step 3: Starting deep market analysis...'))
             market_analysis = self._deep_market_analysis(market_news)
             
             # Step 4: Identify sectors and initial tickers from analysis
-            print(f"\n{console.title('🎯 Step 4: Identifying key sectors and stocks...')}")
+            logger.info("\n%s", console.title('🎯 Step 4: Identifying key sectors and stocks...'))
             sectors, initial_tickers = self._extract_sectors_and_tickers(market_analysis)
-            print(f"{console.info(f'Identified {console.metric(str(len(sectors)))} sectors and {console.metric(str(len(initial_tickers)))} initial tickers')}")
+            logger.info("%s", console.info(f'Identified {console.metric(str(len(sectors)))} sectors and {console.metric(str(len(initial_tickers)))} initial tickers'))
             
             # Save initial tickers to watchlist
-            print(f"\n{console.title('💾 Step 5: Saving initial tickers to watchlist...')}")
+            logger.info("\n%s", console.title('💾 Step 5: Saving initial tickers to watchlist...'))
             self.db.update_watchlist(initial_tickers, "GENERAL_MARKET")
             
             # Step 5: Analyze each sector to get more tickers
-            print(f"\n{console.title('🏢 Step 6: Analyzing identified sectors...')}")
+            logger.info("\n%s", console.title('🏢 Step 6: Analyzing identified sectors...'))
             sector_results = []
-            all_sector_tickers = set()
-            for sector in sectors:
-                print(f"\n{console.highlight(f'📊 Analyzing {sector} sector...')}")
-                sector_result = self.sector_mode.run(sector)
-                if sector_result["success"]:
-                    sector_results.append(sector_result)
-                    all_sector_tickers.update(sector_result["stocks_analyzed"])
+            if sectors:
+                # Sectors are independent and mostly wait on the network, so run them on threads;
+                # the LLM and yfinance calls overlap while WebScraper serializes browser use
+                logger.info("\n%s", console.highlight('📊 Analyzing ' + str(len(sectors)) + ' sectors in parallel...'))
+                with ThreadPoolExecutor(max_workers=min(self._MAX_PARALLEL_RUNS, len(sectors))) as executor:
+                    sector_results = [result for result in executor.map(self.sector_mode.run, sectors) if result["success"]]
+            all_sector_tickers = frozenset(chain.from_iterable(result["stocks_analyzed"] for result in sector_results))
             
             # Save sector tickers to watchlist
-            print(f"\n{console.title('💾 Step 7: Saving sector tickers to watchlist...')}")
+            logger.info("\n%s", console.title('💾 Step 7: Saving sector tickers to watchlist...'))
             self.db.update_watchlist(list(all_sector_tickers), "SECTOR_ANALYSIS")
             
             # Step 6: Get complete watchlist and analyze each stock
-            print(f"\n{console.title('📈 Step 8: Getting complete watchlist for stock analysis...')}")
+            logger.info("\n%s", console.title('📈 Step 8: Getting complete watchlist for stock analysis...'))
             watchlist = self.db.get_watchlist()
-            print(f"{console.info(f'Total tickers in watchlist: {console.metric(str(len(watchlist)))}')}")
+            logger.info("%s", console.info(f'Total tickers in watchlist: {console.metric(str(len(watchlist)))}'))
             
             # Step 7: Analyze each stock in watchlist
-            print(f"\n{console.title('🔍 Step 9: Performing deep stock analysis on watchlist...')}")
-            stock_results = []
-            for ticker in watchlist:
-                print(f"\n{console.highlight(f'🔍 Deep analysis of {ticker}...')}")
-                stock_result = self.single_stock_mode.run(ticker)
-                if stock_result["success"]:
-                    stock_results.append(stock_result)
-                    # Save trade data to database
-                    if "trading_decision" in stock_result:
-                        self.db.save_trade(
-                            ticker=ticker,
-                            **stock_result["trading_decision"]
-                        )
+            logger.info("\n%s", console.title('🔍 Step 9: Performing deep stock analysis on watchlist...'))
+            stock_results = self._analyze_watchlist(watchlist)
             
             # Step 8: Generate comprehensive summary
-            print(f"\n{console.title('📝 Step 10: Generating comprehensive summary...')}")
+            logger.info("\n%s", console.title('📝 Step 10: Generating comprehensive summary...'))
             summary = self._generate_summary(market_analysis, sector_results, stock_results)
             
             # Save final results
-            print(f"\n{console.title('💾 Step 11: Saving results to database...')}")
+            logger.info("\n%s", console.title('💾 Step 11: Saving results to database...'))
             self.db.save_summary("general", stock_results, summary)
             
             return {
@@ -203,123 +178,435 @@ Format your response as valid JSON like this:
             }
             
         except Exception as e:
-            print(f"\n{console.error('❌ Error in general mode:')}", str(e))
-            import traceback
-            print("Traceback:")
-            print(traceback.format_exc())
+            logger.exception("\n%s %s", console.error('❌ Error in general mode:'), e)
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    def _analyze_watchlist(self, watchlist: List[str]) -> List[Dict]:
+        """Deep-analyze watchlist tickers in parallel within the configured budget and deadline
+        
+        Tickers analyzed recently reuse their stored result. At most MAX_STOCK_ANALYSES others
+        are analyzed, and analyses not yet started when the deadline passes are skipped.
+        """
+        stock_results = []
+        recent = self.db.get_recent_stock_summaries(
+            watchlist, datetime.now() - timedelta(hours=STOCK_ANALYSIS_FRESH_HOURS)
+        )
+        for ticker, stored in recent.items():
+            stock_results.append({"success": True, "ticker": ticker, "cached": True, **stored})
+        if recent:
+            logger.info("♻️ Reusing recent analyses of %s tickers", len(recent))
+        
+        to_analyze = [ticker for ticker in watchlist if ticker not in recent]
+        if len(to_analyze) > MAX_STOCK_ANALYSES:
+            logger.info("✂️ Analyzing %s of %s remaining tickers this run", MAX_STOCK_ANALYSES, len(to_analyze))
+            to_analyze = to_analyze[:MAX_STOCK_ANALYSES]
+        if not to_analyze:
+            return stock_results
+        
+        logger.info("\n%s", console.highlight('🔍 Deep analysis of ' + str(len(to_analyze)) + ' tickers in parallel...'))
+        trades = []
+        # Runs share one SingleStockMode; its scraper lets one thread drive the browser at a time
+        with ThreadPoolExecutor(max_workers=min(self._MAX_PARALLEL_RUNS, len(to_analyze))) as executor:
+            futures = {executor.submit(self.single_stock_mode.run, ticker): ticker for ticker in to_analyze}
+            collected = set()
+            try:
+                for future in as_completed(futures, timeout=STOCK_ANALYSIS_DEADLINE):
+                    collected.add(future)
+                    self._collect_stock_result(futures[future], future, stock_results, trades)
+            except FuturesTimeoutError:
+                skipped = sum(future.cancel() for future in futures)
+                logger.warning("⏱️ Stock analysis deadline reached, skipped %s tickers", skipped)
+                # Analyses already running still finish and are kept
+                for future in futures:
+                    if future not in collected and not future.cancelled():
+                        self._collect_stock_result(futures[future], future, stock_results, trades)
+        
+        # Save every trade decision in one round trip
+        if trades:
+            try:
+                self.db.save_trades_bulk(trades)
+                logger.info("✅ Saved %s trades", len(trades))
+            except Exception as e:
+                logger.error("⚠️ Error saving trades: %s", e)
+        return stock_results
+    
+    def _collect_stock_result(self, ticker: str, future: Future, stock_results: List[Dict], trades: List[Dict]) -> None:
+        """Record one finished single-stock analysis and queue its trade for saving"""
+        try:
+            stock_result = future.result()
+        except Exception as e:
+            logger.error("⚠️ Error analyzing %s: %s", ticker, e)
+            return
+        if stock_result["success"]:
+            stock_results.append(stock_result)
+            # Trade data is saved with the rest once all analyses finish
+            if "trading_decision" in stock_result:
+                trades.append({"ticker": ticker, **stock_result["trading_decision"]})
+    
+    async def _process_articles(self, news_urls: List[Dict], session: aiohttp.ClientSession) -> List[Dict]:
+        """Scrape, analyze and save news articles as a staged pipeline, keeping search order
+        
+        The scraper drives a single browser, so one stage loads pages one at a time
+        while the analysis stage groups finished pages and submits each group's prompts
+        to the LLM as one batch, and a writer saves analyses in batches. Each stage hands
+        off through a queue so all three overlap.
+        """
+        # Drop repeated URLs up front, keeping the first occurrence of each normalized URL
+        unique_urls = {}
+        for url_data in news_urls:
+            if url_data.get('url'):
+                unique_urls.setdefault(normalize_url(url_data['url']), url_data['url'])
+        urls = list(unique_urls.values())
+        scraped_queue = asyncio.Queue(maxsize=self._ANALYSIS_BATCH_SIZE)
+        analyzed_queue = asyncio.Queue()
+        results = {}  # Search position -> processed article
+        
+        async def scrape_stage():
+            seen_fingerprints = set()
+            try:
+                recent = await asyncio.to_thread(self._recent_stored_articles, urls)
+                for index, url in enumerate(urls):
+                    if url in recent:
+                        results[index] = recent[url]
+                        fingerprint = recent[url]["content"]["metadata"].get("fingerprint")
+                        if fingerprint:
+                            seen_fingerprints.add(fingerprint)
+                        continue
+                    try:
+                        scraped_data = await self._scrape_article(url, seen_fingerprints)
+                    except Exception as e:
+                        logger.error("⚠️ Error scraping article: %s", e)
+                        continue
+                    if scraped_data:
+                        await scraped_queue.put((index, url, scraped_data))
+            finally:
+                await scraped_queue.put(None)
+        
+        async def analyze_batch(batch):
+            try:
+                news_items = await self._analyze_scraped_articles(
+                    [(url, scraped_data) for _, url, scraped_data in batch], session
+                )
+            except Exception as e:
+                logger.error("⚠️ Error processing articles: %s", e)
+                return
+            for (index, _, _), news_item in zip(batch, news_items):
+                if news_item:
+                    results[index] = news_item
+                    if not news_item.get("stored"):
+                        await analyzed_queue.put(news_item)
+        
+        async def analyze_stage():
+            # Collect the pages scraped within one batch window and submit them together; earlier
+            # batches stay in flight so the LLM keeps working while the next one fills
+            loop = asyncio.get_running_loop()
+            in_flight = []
+            item = True
+            while item is not None:
+                batch = []
+                item = await scraped_queue.get()
+                deadline = loop.time() + self._ANALYSIS_BATCH_WAIT
+                while item is not None:
+                    batch.append(item)
+                    if len(batch) >= self._ANALYSIS_BATCH_SIZE:
+                        break
+                    try:
+                        item = await asyncio.wait_for(scraped_queue.get(), timeout=max(0.0, deadline - loop.time()))
+                    except asyncio.TimeoutError:
+                        break
+                if batch:
+                    in_flight.append(asyncio.ensure_future(analyze_batch(batch)))
+            await asyncio.gather(*in_flight)
+        
+        async def write_stage():
+            # Save scraped content and analyses in bulk, off the event loop, once a batch
+            # fills or the oldest pending article has waited long enough
+            batch = []
+            while True:
+                try:
+                    item = await asyncio.wait_for(
+                        analyzed_queue.get(),
+                        timeout=self._WRITE_BATCH_WAIT if batch else None
+                    )
+                except asyncio.TimeoutError:
+                    item = False
+                if item:
+                    batch.append((item["content"], item["analysis"]))
+                if batch and (not item or len(batch) >= self._WRITE_BATCH_SIZE):
+                    await asyncio.to_thread(self._save_news_batch, batch)
+                    batch = []
+                if item is None:
+                    return
+        
+        writer = asyncio.ensure_future(write_stage())
+        try:
+            await asyncio.gather(scrape_stage(), analyze_stage())
+        finally:
+            await analyzed_queue.put(None)
+            await writer
+        
+        return [results[index] for index in sorted(results)]
+    
+    async def _scrape_article(self, url: str, seen_fingerprints: set) -> Optional[Dict]:
+        """Scrape one article, skipping content already seen this run"""
+        logger.info("\n📄 Scraping article from: %s", url)
+        scraped_data = await asyncio.to_thread(self.web_scraper.scrape_and_analyze, url)
+        
+        if not scraped_data.get("success"):
+            return None
+        
+        # Syndicated copies of an article share their content under different URLs
+        fingerprint = _content_fingerprint(scraped_data.get("content", ""))
+        scraped_data.setdefault("metadata", {})["fingerprint"] = fingerprint
+        if fingerprint in seen_fingerprints:
+            logger.info("⏭️ Skipping duplicate article: %s", url)
+            return None
+        seen_fingerprints.add(fingerprint)
+        return scraped_data
+    
+    async def _analyze_scraped_articles(self, items: List[Tuple[str, Dict]],
+                                        session: aiohttp.ClientSession) -> List[Optional[Dict]]:
+        """Analyze scraped (url, page) pairs with one batched LLM submission, reusing analyses stored by earlier runs
+        
+        Returns one processed article, or None on failure, per input in order.
+        """
+        news_items = list(await asyncio.gather(
+            *(asyncio.to_thread(self._stored_article, url, scraped_data) for url, scraped_data in items)
+        ))
+        
+        # Build every remaining prompt first, submit them together, then parse the responses
+        pending = [index for index, news_item in enumerate(news_items) if news_item is None]
+        if pending:
+            logger.info("\n📝 Generating analyses for %s articles...", len(pending))
+            responses = await self.ai_analyzer.generate_responses_batch_async(
+                [self._article_prompt(*items[index]) for index in pending], session,
+                format_schema=ARTICLE_ANALYSIS_SCHEMA
+            )
+            for index, analysis_content in zip(pending, responses):
+                try:
+                    news_items[index] = self._parse_article_analysis(*items[index], analysis_content)
+                except Exception as e:
+                    logger.error("⚠️ Error processing article: %s", e)
+        return news_items
+    
+    def _recent_stored_articles(self, urls: List[str]) -> Dict[str, Dict]:
+        """Return processed articles for URLs saved in the last _RECENT_NEWS_HOURS, keyed by URL
+        
+        These are reused as they are, skipping both the scrape and the analysis.
+        """
+        since = datetime.now() - timedelta(hours=self._RECENT_NEWS_HOURS)
+        recent = {}
+        for url, article in self.db.get_recent_news_by_url(urls, since).items():
+            if not article.get("analysis"):
+                continue
+            scraped_data = {
+                "success": True,
+                "url": url,
+                "content": article.get("content", ""),
+                "metadata": {
+                    "source": article.get("source", "unknown"),
+                    "timestamp": article.get("timestamp", str(datetime.now())),
+                    "content_length": article.get("content_length", 0)
+                }
+            }
+            if article.get("fingerprint"):
+                scraped_data["metadata"]["fingerprint"] = article["fingerprint"]
+            analysis_data = dict(article["analysis"])
+            analysis_data.update(source=scraped_data["metadata"]["source"], url=url, timestamp=str(datetime.now()))
+            recent[url] = {"content": scraped_data, "analysis": analysis_data, "stored": True}
+        
+        if recent:
+            logger.info("\n♻️ Reusing %s articles saved in the last %s hours", len(recent), self._RECENT_NEWS_HOURS)
+        return recent
+    
+    def _stored_article(self, url: str, scraped_data: Dict) -> Optional[Dict]:
+        """Return the processed article for content analyzed by an earlier run, if any"""
+        fingerprint = scraped_data.get("metadata", {}).get("fingerprint")
+        stored = self.db.get_news_by_fingerprint(fingerprint) if fingerprint else None
+        if not stored or not stored.get("analysis"):
+            return None
+        
+        logger.info("\n♻️ Reusing stored analysis for article from %s", url)
+        analysis_data = dict(stored["analysis"])
+        analysis_data.update(source=scraped_data.get("metadata", {}).get("source", "unknown"), url=url,
+                             timestamp=str(datetime.now()))
+        # Already saved by the run that analyzed it
+        return {"content": scraped_data, "analysis": analysis_data, "stored": True}
+    
+    def _article_prompt(self, url: str, scraped_data: Dict) -> str:
+        """Build the analysis prompt for one scraped article"""
+        return _article_analysis_prompt(
+            content=extract_relevant(scraped_data.get('content') or "", _MAX_ARTICLE_PROMPT_CHARS),
+            source=scraped_data.get('metadata', {}).get('source', 'unknown'),
+            url=url
+        )
+    
+    def _parse_article_analysis(self, url: str, scraped_data: Dict, analysis_content: str) -> Optional[Dict]:
+        """Turn one LLM response into a processed article, or None if it is not valid JSON"""
+        try:
+            analysis_data = _safe_parse_llm_json(analysis_content)
+        except JSONDecodeError as e:
+            logger.warning("⚠️ JSON parsing error: %s", e)
+            logger.debug("Raw content: %s", analysis_content)
+            return None
+        
+        # Add metadata
+        analysis_data["source"] = scraped_data.get("metadata", {}).get("source", "unknown")
+        analysis_data["url"] = url
+        analysis_data["timestamp"] = str(datetime.now())
+        
+        # One record per article; the lines are only built when INFO is enabled
+        if logger.isEnabledFor(logging.INFO):
+            lines = [
+                f"\n✅ Successfully processed article from {analysis_data['source']}",
+                f"📊 Sentiment: {analysis_data['sentiment']} ({analysis_data['confidence']}% confidence)",
+                f"📝 Key Points: {len(analysis_data['key_points'])}"
+            ]
+            if analysis_data.get('mentioned_tickers'):
+                lines.append("🎯 Found tickers: " + ", ".join(t['ticker'] for t in analysis_data['mentioned_tickers']))
+            logger.info("%s", "\n".join(lines))
+        
+        # Add to market news for further analysis
+        return {
+            "content": scraped_data,
+            "analysis": analysis_data
+        }
+    
+    def _validate_tickers(self, tickers: List[str]) -> Dict[str, bool]:
+        """Validate tickers at most once per run, asking yfinance only about ones not checked yet
+        
+        Symbols that cannot be tickers, or are common words in news text, are rejected without a request.
+        """
+        symbols = {ticker: normalize_ticker(ticker) for ticker in tickers if isinstance(ticker, str)}
+        for symbol in symbols.values():
+            if not symbol or symbol in _NOT_TICKERS:
+                self._validation_cache[symbol] = False
+        missing = sorted({symbol for symbol in symbols.values() if symbol not in self._validation_cache})
+        if missing:
+            self._validation_cache.update(self.stock_data.validate_tickers_batch(missing))
+        return {ticker: self._validation_cache.get(symbol, False) for ticker, symbol in symbols.items()}
+    
     def _save_news(self, news_data: Dict, processed_data: Dict = None) -> None:
         """Save news and its analysis to databases with enhanced metadata"""
+        self._save_news_batch([(news_data, processed_data)])
+    
+    def _save_news_batch(self, items: List[Tuple[Dict, Optional[Dict]]]) -> None:
+        """Save several scraped articles and their analyses with one write per database
+        
+        Tickers mentioned across all articles are validated together in one yfinance request.
+        """
+        if not items:
+            return
         try:
-            # Prepare article data with both scraped content and analysis
-            article = {
-                "content": news_data.get("content", ""),
-                "url": news_data.get("url", ""),
-                "source": news_data.get("metadata", {}).get("source", "unknown"),
-                "timestamp": news_data.get("metadata", {}).get("timestamp", str(datetime.now())),
-                "content_length": news_data.get("metadata", {}).get("content_length", 0)
+            # Validate tickers before adding them to the analyses
+            mentioned = {
+                ticker_info["ticker"]
+                for _, processed_data in items if processed_data
+                for ticker_info in processed_data.get("mentioned_tickers", []) if ticker_info.get("ticker")
             }
+            if mentioned:
+                logger.info("\n🔍 Validating %s mentioned tickers...", len(mentioned))
+            valid = self._validate_tickers(sorted(mentioned))
+            if mentioned and logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Valid: %s", ", ".join(t for t in sorted(mentioned) if valid.get(t)) or "none")
+                logger.info("❌ Invalid: %s", ", ".join(t for t in sorted(mentioned) if not valid.get(t)) or "none")
             
-            # Add LLM analysis if available
-            if processed_data:
-                # Validate tickers before adding to analysis
-                validated_tickers = []
-                if "mentioned_tickers" in processed_data:
-                    print(f"\n{console.title('🔍 Validating mentioned tickers...')}")
-                    for ticker_info in processed_data["mentioned_tickers"]:
-                        ticker = ticker_info.get("ticker")
-                        if ticker:
-                            try:
-                                # Validate with yfinance
-                                data = self.stock_data.get_stock_data(ticker, period="1d")
-                                if data["success"]:
-                                    print(f"{console.success('✅ Valid ticker found: ' + console.ticker(ticker))}")
-                                    validated_tickers.append(ticker_info)
-                                else:
-                                    print(f"{console.error('❌ Invalid ticker: ' + console.ticker(ticker))}")
-                            except Exception as e:
-                                print(f"{console.error('⚠️ Error validating ticker ' + console.ticker(ticker) + ': ' + str(e))}")
-                                continue
-                
-                # Update processed data with only validated tickers
-                processed_data["mentioned_tickers"] = validated_tickers
-                
-                # Bundle the analysis with the article data
-                article.update({
-                    "analysis": {
-                        "summary": processed_data.get("summary", ""),
-                        "sentiment": processed_data.get("sentiment", "neutral"),
-                        "confidence": processed_data.get("confidence", 0),
-                        "key_points": processed_data.get("key_points", []),
-                        "market_impact": processed_data.get("market_impact", ""),
-                        "sector_implications": processed_data.get("sector_implications", []),
-                        "mentioned_tickers": validated_tickers
-                    }
-                })
+            articles = [self._news_article(news_data, processed_data, valid) for news_data, processed_data in items]
             
             # Save to MongoDB
-            source = article["source"]
-            self.db.save_news("MARKET", article, source)
-            print(f"{console.success('✅ Saved article and analysis from ' + source + ' to MongoDB')}")
+            self.db.save_news_bulk("MARKET", articles)
+            logger.info("✅ Saved %s articles and analyses to MongoDB", len(articles))
             
             # Save to ChromaDB
             if hasattr(self.ai_analyzer, 'chroma_handler') and self.ai_analyzer.chroma_handler:
-                # Save to news collection with same structure as MongoDB
-                self.ai_analyzer.chroma_handler.save_document(
-                    collection_name="news",
-                    document=article["content"],
-                    metadata={
-                        "source": article["source"],
-                        "url": article["url"],
-                        "timestamp": article["timestamp"],
-                        "analysis": json.dumps(article.get("analysis", {}))  # Convert analysis dict to JSON string
-                    }
-                )
-                print(f"{console.success('✅ Saved article and analysis to ChromaDB news collection')}")
+                # Save to news collection with same structure as MongoDB; the handler batches queued writes
+                for article in articles:
+                    self.ai_analyzer.chroma_handler.save_text_document(
+                        collection_name="news",
+                        text=article["content"],
+                        metadata={
+                            "source": article["source"],
+                            "url": article["url"],
+                            "timestamp": article["timestamp"],
+                            "analysis": dumps_compact(article.get("analysis", {}))  # Convert analysis dict to JSON string
+                        }
+                    )
+                logger.info("✅ Saved articles and analyses to ChromaDB news collection")
                 
         except Exception as e:
-            print(f"{console.error('⚠️ Error saving news: ' + str(e))}")
-            import traceback
-            print(f"{console.error('Traceback:')}")
-            print(f"{console.error(traceback.format_exc())}")
+            logger.exception("⚠️ Error saving news: %s", e)
+    
+    def _news_article(self, news_data: Dict, processed_data: Optional[Dict], valid_tickers: Dict[str, bool]) -> Dict:
+        """Build the stored form of a scraped article, keeping only validated tickers in its analysis"""
+        # Prepare article data with both scraped content and analysis
+        article = {
+            "content": news_data.get("content", ""),
+            "url": news_data.get("url", ""),
+            "source": news_data.get("metadata", {}).get("source", "unknown"),
+            "timestamp": news_data.get("metadata", {}).get("timestamp", str(datetime.now())),
+            "content_length": news_data.get("metadata", {}).get("content_length", 0)
+        }
+        if news_data.get("metadata", {}).get("fingerprint"):
+            article["fingerprint"] = news_data["metadata"]["fingerprint"]
+        
+        # Add LLM analysis if available
+        if processed_data:
+            validated_tickers = [
+                {**ticker_info, "ticker": normalize_ticker(ticker_info["ticker"])}
+                for ticker_info in processed_data.get("mentioned_tickers", [])
+                if valid_tickers.get(ticker_info.get("ticker"))
+            ]
+            
+            # Update processed data with only validated tickers
+            processed_data["mentioned_tickers"] = validated_tickers
+            
+            # Bundle the analysis with the article data
+            article.update({
+                "analysis": {
+                    "summary": processed_data.get("summary", ""),
+                    "sentiment": processed_data.get("sentiment", "neutral"),
+                    "confidence": processed_data.get("confidence", 0),
+                    "key_points": processed_data.get("key_points", []),
+                    "market_impact": processed_data.get("market_impact", ""),
+                    "sector_implications": processed_data.get("sector_implications", []),
+                    "mentioned_tickers": validated_tickers
+                }
+            })
+        return article
             
     def _process_and_save_tickers(self, ticker_data: List[Dict]) -> None:
         """Process and save tickers to watchlist with validation"""
         try:
             validated_tickers = {}  # Dict to store tickers by sector
             
+            ticker_data = [t for t in ticker_data if t.get("ticker")]
+            logger.info("%s", console.info('Validating ' + str(len(ticker_data)) + ' tickers...'))
+            # Validate all tickers with one yfinance request, then bucket by sector
+            valid = self._validate_tickers([t["ticker"] for t in ticker_data])
+            
             for ticker_info in ticker_data:
-                ticker = ticker_info.get("ticker")
+                ticker = ticker_info["ticker"]
                 sector = ticker_info.get("sector", "UNKNOWN")
                 
-                if not ticker:
-                    continue
-                    
-                print(f"{console.info('Validating ticker: ' + console.ticker(ticker) + ' (Sector: ' + sector + ')')}")
-                try:
-                    # Validate with yfinance
-                    data = self.stock_data.get_stock_data(ticker, period="1d")
-                    if data["success"]:
-                        print(f"{console.success('✅ Valid ticker found: ' + console.ticker(ticker))}")
-                        # Initialize sector in dict if not exists
-                        if sector not in validated_tickers:
-                            validated_tickers[sector] = set()
-                        # Add ticker to its sector
-                        validated_tickers[sector].add(ticker)
-                    else:
-                        print(f"{console.error('❌ Invalid ticker: ' + console.ticker(ticker))}")
-                except Exception as e:
-                    print(f"{console.error('⚠️ Error validating ticker ' + console.ticker(ticker) + ': ' + str(e))}")
+                if valid.get(ticker):
+                    logger.info("%s", console.success('✅ Valid ticker found: ' + console.ticker(ticker) + ' (Sector: ' + sector + ')'))
+                    # Initialize sector in dict if not exists
+                    if sector not in validated_tickers:
+                        validated_tickers[sector] = set()
+                    # Add ticker to its sector, in the form yfinance expects
+                    validated_tickers[sector].add(normalize_ticker(ticker))
+                else:
+                    logger.warning("%s", console.error('❌ Invalid ticker: ' + console.ticker(ticker)))
             
-            # Save validated tickers to watchlist by sector
+            # Save validated tickers to watchlist by sector in one bulk write
+            if validated_tickers:
+                logger.info("%s", console.info('Saving tickers for ' + str(len(validated_tickers)) + ' sectors'))
+                self.db.update_watchlists({sector: list(tickers) for sector, tickers in validated_tickers.items()})
             for sector, tickers in validated_tickers.items():
                 if tickers:  # Only save if there are tickers for this sector
-                    print(f"{console.info('Saving ' + str(len(tickers)) + ' tickers for sector: ' + sector)}")
-                    self.db.update_watchlist(list(tickers), sector)
                     
                     # Save to ChromaDB watchlist collection
                     if hasattr(self.ai_analyzer, 'chroma_handler') and self.ai_analyzer.chroma_handler:
@@ -327,22 +614,22 @@ Format your response as valid JSON like this:
                             "sector": sector,
                             "tickers": list(tickers)
                         }
-                        self.ai_analyzer.chroma_handler.save_document(
+                        self.ai_analyzer.chroma_handler.save_json_document(
                             collection_name="watchlist",
-                            document=watchlist_data,
+                            payload=watchlist_data,
                             metadata={
                                 "sector": sector,
                                 "timestamp": str(datetime.now())
                             }
                         )
-                        print(f"{console.success('✅ Saved ' + sector + ' tickers to ChromaDB watchlist')}")
+                        logger.info("%s", console.success('✅ Saved ' + sector + ' tickers to ChromaDB watchlist'))
                         
         except Exception as e:
-            print(f"{console.error('⚠️ Error processing tickers: ' + str(e))}")
+            logger.error("%s", console.error('⚠️ Error processing tickers: ' + str(e)))
     
     def _deep_market_analysis(self, market_news: List[Dict]) -> Dict:
         """Perform deep analysis of market news with follow-up questions"""
-        print("\n=== Starting Deep Market Analysis ===")
+        logger.info("\n=== Starting Deep Market Analysis ===")
         
         all_findings = {
             "rounds": [],
@@ -352,88 +639,13 @@ Format your response as valid JSON like this:
             "mentioned_tickers": {}  # Using dict to store tickers by sector
         }
         
-        # Process raw content through LLM first
-        processed_articles = []
-        for article in market_news:
-            # The article structure should have content and analysis from previous step
-            if article.get("content") and article.get("analysis"):
-                # Create prompt for initial content processing
-                process_prompt = f"""Analyze this financial news article and extract key information:
-
-Content:
-{article["content"].get("content", "")}
-
-Source: {article["content"].get("metadata", {}).get("source", "unknown")}
-URL: {article["content"].get("url", "")}
-
-Please provide a structured analysis with the following information:
-- A brief 2-3 sentence summary
-- Sentiment (bullish/bearish/neutral)
-- Confidence score (0-100)
-- Key points as bullet points
-- Potential market impact
-- Any stock tickers mentioned with their sectors (only valid stock symbols, 1-5 capital letters)
-- Sector implications
-
-Format your response like the example JSON below, do not copy the example JSON, just use it as a guide:
-{{{{
-    "summary": "your summary here",
-    "sentiment": "bullish/bearish/neutral",
-    "confidence": 50,
-    "key_points": [
-        "point 1",
-        "point 2"
-    ],
-    "market_impact": "description here",
-    "mentioned_tickers": [
-        {{"ticker": "AAPL", "sector": "TECHNOLOGY"}},
-        {{"ticker": "MSFT", "sector": "TECHNOLOGY"}}
-    ],
-    "sector_implications": [
-        "implication 1",
-        "implication 2"
-    ]
-}}}}"""
-                
-                try:
-                    print(f"\n🔄 Processing article from {article['content'].get('metadata', {}).get('source', 'unknown')}")
-                    
-                    # Process through LLM
-                    processed_content = self.ai_analyzer._generate_response(process_prompt)
-                    
-                    # Clean up any potential trailing commas in JSON
-                    processed_content = processed_content.replace(",}", "}")
-                    processed_content = processed_content.replace(",]", "]")
-                    
-                    try:
-                        processed_data = json.loads(processed_content)
-                        
-                        # Add source metadata
-                        processed_data["source"] = article["content"].get("metadata", {}).get("source", "unknown")
-                        processed_data["url"] = article["content"].get("url", "")
-                        processed_data["timestamp"] = str(datetime.now())
-                        
-                        # Save both original and processed data
-                        self._save_news(article["content"], processed_data)
-                        processed_articles.append(processed_data)
-                        
-                        print(f"✅ Successfully processed article")
-                        print(f"📊 Sentiment: {processed_data.get('sentiment')} ({processed_data.get('confidence')}% confidence)")
-                        print(f"📝 Key Points: {len(processed_data.get('key_points', []))}")
-                        
-                    except json.JSONDecodeError as e:
-                        print(f"⚠️ JSON parsing error: {str(e)}")
-                        print("Raw content:", processed_content)
-                        continue
-                        
-                except Exception as e:
-                    print(f"⚠️ Error processing article: {str(e)}")
-                    continue
+        # Step 2 analyzed and saved every article it returns, so reuse those analyses
+        processed_articles = [article["analysis"] for article in market_news if article.get("analysis")]
         
-        print(f"\n📊 Successfully processed {len(processed_articles)} articles")
+        logger.info("\n📊 Successfully processed %s articles", len(processed_articles))
         
         # Analyze all processed articles together
-        print("\n🔄 Generating combined analysis...")
+        logger.info("\n🔄 Generating combined analysis...")
         combined_analysis = self.ai_analyzer.analyze_news(processed_articles)
         
         # Save combined analysis to database
@@ -457,44 +669,43 @@ Format your response like the example JSON below, do not copy the example JSON,
                     "average_confidence": combined_analysis.get("confidence", 0)
                 }
             })
-            print("✅ Saved combined analysis to MongoDB")
+            logger.info("✅ Saved combined analysis to MongoDB")
             
             # Save to ChromaDB
             if hasattr(self.ai_analyzer, 'chroma_handler') and self.ai_analyzer.chroma_handler:
+                analysis_str = dumps_compact(combined_analysis)  # Serialized once for both document and metadata
                 chroma_data = {
-                    "document": json.dumps(combined_analysis, indent=4),
+                    "document": analysis_str,
                     "metadata": {
                         "type": "market_summary",
                         "timestamp": str(datetime.now()),
                         "articles_analyzed": len(processed_articles),
-                        "analysis": json.dumps(combined_analysis)  # Convert analysis to JSON string
+                        "analysis": analysis_str
                     }
                 }
-                self.ai_analyzer.chroma_handler.save_document(
+                self.ai_analyzer.chroma_handler.save_text_document(
                     collection_name="summary",
-                    document=chroma_data["document"],
+                    text=chroma_data["document"],
                     metadata=chroma_data["metadata"]
                 )
-                print("✅ Saved combined analysis to ChromaDB")
+                logger.info("✅ Saved combined analysis to ChromaDB")
                 
         except Exception as e:
-            print(f"⚠️ Error saving combined analysis: {str(e)}")
+            logger.error("⚠️ Error saving combined analysis: %s", e)
         
         return combined_analysis
     
     def _extract_sectors_and_tickers(self, market_analysis: Dict) -> tuple[List[str], List[str]]:
         """Extract relevant sectors and tickers from market analysis"""
-        print("\n=== Extracting Sectors and Tickers ===")
+        logger.info("\n=== Extracting Sectors and Tickers ===")
         
         # Create a prompt for sector and ticker extraction
-        prompt = f"""Analyze this market analysis and identify:
+        # Static instructions first and the analysis last, keeping the prompt prefix cacheable
+        prompt = f"""Analyze the market analysis below and identify:
 1. Key market sectors that are showing significant activity or opportunities
 2. Specific stock tickers mentioned or implied
 3. Rank both sectors and tickers by relevance and potential
 
-Market Analysis:
-{json.dumps(market_analysis, indent=2)}
-
 Provide analysis in JSON format:
 {{
     "sectors": [
@@ -503,60 +714,71 @@ Provide analysis in JSON format:
     "tickers": [
         {{"symbol": "TICK", "sector": "sector_name", "relevance": "high/medium/low"}}
     ]
-}}"""
+}}
+
+Market Analysis:
+{dumps_compact(market_analysis)}"""
 
         # Get AI response
         try:
-            response = self.ai_analyzer._generate_response(prompt)
-            analysis = json.loads(response)
+            response = self.ai_analyzer.generate_response(prompt)
+            analysis = _safe_parse_llm_json(response)
             
             # Extract and validate sectors
-            sectors = []
-            for sector_info in analysis.get("sectors", []):
-                if sector_info.get("relevance", "").lower() in ["high", "medium"]:
-                    sectors.append(sector_info["name"])
+            sectors = [
+                sector_info["name"]
+                for sector_info in analysis.get("sectors", [])
+                if str(sector_info.get("relevance") or "").lower() in _RELEVANT and sector_info.get("name")
+            ]
             
-            # Extract and validate tickers
-            tickers = []
-            for ticker_info in analysis.get("tickers", []):
-                ticker = ticker_info.get("symbol", "")
-                if ticker_info.get("relevance", "").lower() in ["high", "medium"]:
-                    print(f"\nValidating {ticker}...")
-                    data = self.stock_data.get_stock_data(ticker, period="1d")
-                    if data["success"]:
-                        print(f"✓ {ticker} is valid")
-                        tickers.append(ticker)
-                    else:
-                        print(f"✗ {ticker} is invalid")
+            # Extract tickers once each, then validate them together
+            candidates = list(dict.fromkeys(
+                symbol
+                for ticker_info in analysis.get("tickers", [])
+                if str(ticker_info.get("relevance") or "").lower() in _RELEVANT
+                for symbol in [normalize_ticker(ticker_info.get("symbol"))]
+                if symbol  # Skip entries the model left without a ticker-shaped symbol
+            ))
+            logger.info("\nValidating %s tickers...", len(candidates))
+            valid = self._validate_tickers(candidates)
+            tickers = [ticker for ticker in candidates if valid.get(ticker)]
+            invalid = [ticker for ticker in candidates if not valid.get(ticker)]
+            logger.info("✓ Valid: %s", ', '.join(tickers) or 'none')
+            logger.info("✗ Invalid: %s", ', '.join(invalid) or 'none')
             
             return sectors[:5], tickers  # Limit to top 5 sectors
             
         except Exception as e:
-            print(f"Error extracting sectors and tickers: {str(e)}")
+            logger.error("Error extracting sectors and tickers: %s", e)
             return [], []
     
     def _generate_summary(self, market_analysis: Dict, sector_results: List[Dict], stock_results: List[Dict]) -> Dict:
         """Generate comprehensive trading summary"""
-        print("\n=== Generating Comprehensive Summary ===")
+        logger.info("\n=== Generating Comprehensive Summary ===")
         
-        # Aggregate trading decisions
-        all_decisions = []
+        # Collect trading decisions, counting recommendations and total confidence in the
+        # same pass; malformed decisions are tolerated
+        decision_count = 0
+        recommendation_counts = Counter()
+        confidence_sum = 0.0
+        confidence_count = 0
         for result in stock_results:
-            if "trading_decision" in result:
-                print(f"Processing trading decision: {result['trading_decision']}")
-                all_decisions.append(result["trading_decision"])
-            else:
-                print(f"Warning: No trading decision found in result: {result.keys()}")
-        
-        print(f"Total decisions collected: {len(all_decisions)}")
-        
-        buy_decisions = [d for d in all_decisions if d.get("recommendation", "").lower() == "buy"]
-        sell_decisions = [d for d in all_decisions if d.get("recommendation", "").lower() == "sell"]
-        hold_decisions = [d for d in all_decisions if d.get("recommendation", "").lower() == "hold"]
+            decision = result.get("trading_decision")
+            if decision is None:
+                logger.warning("No trading decision found in result: %s", list(result))
+                continue
+            logger.debug("Processing trading decision: %s", decision)
+            decision_count += 1
+            recommendation_counts[str(decision.get("recommendation") or "").lower()] += 1
+            confidence = decision.get("confidence")
+            if isinstance(confidence, (int, float)):
+                confidence_sum += confidence
+                confidence_count += 1
         
-        print(f"Buy decisions: {len(buy_decisions)}")
-        print(f"Sell decisions: {len(sell_decisions)}")
-        print(f"Hold decisions: {len(hold_decisions)}")
+        logger.info("Total decisions collected: %s", decision_count)
+        logger.info("Buy decisions: %s", recommendation_counts['buy'])
+        logger.info("Sell decisions: %s", recommendation_counts['sell'])
+        logger.info("Hold decisions: %s", recommendation_counts['hold'])
         
         # Calculate sector performance
         sector_insights = []
@@ -579,10 +801,10 @@ Provide analysis in JSON format:
             "sector_insights": sector_insights,
             "total_stocks_analyzed": len(stock_results),
             "trading_decisions": {
-                "total": len(all_decisions),
-                "buy": len(buy_decisions),
-                "sell": len(sell_decisions),
-                "hold": len(hold_decisions)
+                "total": decision_count,
+                "buy": recommendation_counts["buy"],
+                "sell": recommendation_counts["sell"],
+                "hold": recommendation_counts["hold"]
             },
-            "average_confidence": sum(d["confidence"] for d in all_decisions) / len(all_decisions) if all_decisions else 0
+            "average_confidence": confidence_sum / confidence_count if confidence_count else 0
         } 
\ No newline at end of file
@@ -1,5 +1,9 @@
 import os
 import sys
+import atexit
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, Any
 from datetime import datetime
 
@@ -9,6 +13,17 @@ from single_stock_mode import SingleStockMode
 from database import DatabaseHandler
 from ai_analysis import AIAnalyzer
 
+# Plain message format keeps module log output looking like the console prints.
+# Records are handed to a background listener thread, so worker threads and the
+# event loop never block writing to the console.
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(message)s"))
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), handlers=[QueueHandler(_log_queue)])
+
 class StockBot:
     def __init__(self):
         self.db = DatabaseHandler()
@@ -4,6 +4,7 @@ from config import SEARXNG_URL
 from web_scraper import WebScraper
 import pprint
 import time
+import traceback
 from ai_analysis import AIAnalyzer
 
 class NewsSearcher:
@@ -64,7 +65,6 @@ class NewsSearcher:
             print("\n❌ Error in search process:")
             print(f"Error type: {type(e).__name__}")
             print(f"Error message: {str(e)}")
-            import traceback
             print("\nTraceback:")
             print(traceback.format_exc())
             return []
@@ -0,0 +1,116 @@
+from typing import Any, List
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# Response shapes for Ollama's structured output mode. The JSON schemas generated
+# from these models are sent as the "format" field so the server constrains
+# generation to parseable JSON of the expected shape.
+
+# Models with defaults also validate responses. Their schemas are generated in
+# serialization mode with this config so every field is still required of the model.
+_DEFAULTS_REQUIRED = ConfigDict(json_schema_serialization_defaults_required=True)
+
+class NewsReasoning(BaseModel):
+    model_config = _DEFAULTS_REQUIRED
+    bullish_factors: List[str] = []
+    bearish_factors: List[str] = []
+    conclusion: str = "No detailed conclusion available"
+
+class NewsAnalysis(BaseModel):
+    """Structured analysis of a batch of news articles; missing fields get neutral defaults"""
+    model_config = _DEFAULTS_REQUIRED
+    summaries: List[str] = []
+    themes: List[str] = []
+    sentiment: str = "neutral"
+    confidence: int = 0
+    key_points: List[str] = []
+    market_impact: str = "No market impact analysis available"
+    reasoning: NewsReasoning = Field(default_factory=NewsReasoning)
+    
+    @field_validator("summaries", "themes", "key_points", mode="before")
+    @classmethod
+    def _tidy_items(cls, value: Any) -> Any:
+        """Stringify and strip list items, dropping empty ones"""
+        if isinstance(value, list):
+            return [str(item).strip() for item in value if item]
+        return value
+
+class MentionedTicker(BaseModel):
+    ticker: str
+    sector: str
+
+class ArticleAnalysis(BaseModel):
+    """Structured analysis of a single scraped news article"""
+    summary: str
+    sentiment: str
+    confidence: int
+    key_points: List[str]
+    market_impact: str
+    mentioned_tickers: List[MentionedTicker]
+    sector_implications: List[str]
+
+class DecisionReasoning(BaseModel):
+    technical_factors: List[str]
+    fundamental_factors: List[str]
+    risk_factors: List[str]
+    decision_process: str
+
+class Scenarios(BaseModel):
+    best_case: str
+    worst_case: str
+    most_likely: str
+
+class RiskAssessment(BaseModel):
+    risk_level: str
+    key_risks: List[str]
+    mitigation_strategies: List[str]
+
+class TradingDecision(BaseModel):
+    """Trading decision for a single ticker"""
+    action: str
+    confidence: int
+    quantity: float
+    entry_price: float
+    stop_loss: float
+    take_profit: float
+    reasoning: DecisionReasoning
+    scenarios: Scenarios
+    risk_assessment: RiskAssessment
+
+class FollowUpQuestion(BaseModel):
+    text: str
+    tool: str
+    rationale: str
+
+class FollowUpQuestions(BaseModel):
+    """Research questions to ask about a ticker"""
+    questions: List[FollowUpQuestion]
+
+class TickerQuestions(BaseModel):
+    ticker: str
+    questions: List[FollowUpQuestion]
+
+class FollowUpQuestionsBatch(BaseModel):
+    """Research questions for several tickers from one prompt"""
+    results: List[TickerQuestions]
+
+class PersonalitySelection(BaseModel):
+    """Trading personality chosen for current market conditions"""
+    personality: str
+    market_conditions: List[str]
+    reasoning: str
+    expected_performance: str
+
+class FullAnalysis(BaseModel):
+    """Combined response of the fused full analysis prompt"""
+    personality: PersonalitySelection
+    news_analysis: NewsAnalysis
+    questions: List[FollowUpQuestion]
+    decision: TradingDecision
+
+NEWS_ANALYSIS_SCHEMA = NewsAnalysis.model_json_schema(mode="serialization")
+ARTICLE_ANALYSIS_SCHEMA = ArticleAnalysis.model_json_schema()
+TRADING_DECISION_SCHEMA = TradingDecision.model_json_schema()
+FOLLOW_UP_QUESTIONS_SCHEMA = FollowUpQuestions.model_json_schema()
+FOLLOW_UP_QUESTIONS_BATCH_SCHEMA = FollowUpQuestionsBatch.model_json_schema()
+PERSONALITY_SELECTION_SCHEMA = PersonalitySelection.model_json_schema()
+FULL_ANALYSIS_SCHEMA = FullAnalysis.model_json_schema(mode="serialization")
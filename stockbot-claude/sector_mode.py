@@ -7,6 +7,7 @@ from database import DatabaseHandler
 from utils.console_colors import console
 import json
 import time
+import traceback
 from single_stock_mode import SingleStockMode
 
 class SectorMode:
@@ -15,6 +16,11 @@ class SectorMode:
         self.ai_analyzer = AIAnalyzer()
         self.stock_data = StockDataHandler()
         self.db = DatabaseHandler()
+        # Shared by every stock, and by sectors running on parallel threads, instead of a fresh
+        # one per stock that would start another headless browser for each ticker. Its
+        # WebScraper serializes navigation of that one browser, so threads never get
+        # each other's pages; their LLM and yfinance work still runs in parallel.
+        self.single_stock_mode = SingleStockMode()
     
     def run(self, sector: str) -> Dict:
         """Run sector mode trading analysis with enhanced stock analysis"""
@@ -30,14 +36,18 @@ class SectorMode:
             # Step 2: Process each article with LLM summarization
             print(f"\n{console.title('2. Summarizing news articles...')}")
             summarized_articles = []
-            for i, article in enumerate(sector_news, 1):
+            # Articles are independent, so analyze them concurrently up front
+            analyses = self.ai_analyzer.analyze_contents([
+                {
+                    "success": True,
+                    "content": article["content"],
+                    "metadata": {"source": article.get("source", "unknown")}
+                } if article.get("content") else {"success": False, "error": "No content"}
+                for article in sector_news
+            ])
+            for i, (article, analysis) in enumerate(zip(sector_news, analyses), 1):
                 print(f"\nProcessing article {i}/{len(sector_news)}...")
                 if article.get("content"):
-                    analysis = self.ai_analyzer.analyze_content({
-                        "success": True,
-                        "content": article["content"],
-                        "metadata": {"source": article.get("source", "unknown")}
-                    })
                     if analysis["success"]:
                         summarized_articles.append({
                             "summary": analysis["summary"],
@@ -94,7 +104,6 @@ class SectorMode:
             
         except Exception as e:
             print(f"\n{console.error(f'Error in sector mode: {str(e)}')}")
-            import traceback
             print(f"{console.error('Traceback:')}")
             print(f"{console.error(traceback.format_exc())}")
             return {
@@ -105,8 +114,7 @@ class SectorMode:
     def _save_news(self, news: List[Dict], sector: str) -> None:
         """Save sector news to database"""
         print(f"Saving {len(news)} news articles for {sector} sector to database...")
-        for article in news:
-            self.db.save_news(sector.upper(), article, article.get("source", "unknown"))
+        self.db.save_news_bulk(sector.upper(), news)
     
     def _extract_tickers_from_news(self, news_articles: List[Dict]) -> List[str]:
         """Extract and validate ticker symbols from news articles using AI analysis and yfinance"""
@@ -142,7 +150,7 @@ News articles to analyze:
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    response = self.ai_analyzer._generate_response(prompt)
+                    response = self.ai_analyzer.generate_response(prompt)
                     response = response.strip()
                     
                     # Clean up response to ensure it's valid JSON
@@ -161,23 +169,24 @@ News articles to analyze:
                     # Parse JSON
                     analysis = json.loads(response)
                     
-                    # Extract tickers and get their data (but don't validate)
-                    valid_tickers = []
+                    # Extract tickers and get their data in one request (but don't validate)
+                    candidates = {}
                     for ticker_info in analysis.get("identified_tickers", []):
                         ticker = ticker_info.get("ticker", "").strip().upper()
                         confidence = ticker_info.get("confidence", 0)
                         
-                        if ticker and confidence >= 80:  # Only include high confidence tickers
-                            print(f"\n{console.info(f'Getting data for {console.ticker(ticker)}...')}")
-                            try:
-                                # Get stock data for later analysis
-                                time.sleep(0.5)  # Add delay between API calls
-                                data = self.stock_data.get_stock_data(ticker, period="1d")
-                                valid_tickers.append(ticker)
+                        if ticker and confidence >= 80 and ticker not in candidates:  # Only include high confidence tickers
+                            candidates[ticker] = confidence
+                    
+                    valid_tickers = list(candidates)
+                    if valid_tickers:
+                        print(f"\n{console.info(f'Getting data for {len(valid_tickers)} tickers...')}")
+                        data = self.stock_data.get_many(valid_tickers, period="1d")
+                        for ticker, confidence in candidates.items():
+                            if data[ticker]["success"]:
                                 print(f"{console.success(f'✓ Added {ticker} ({confidence}% confidence)')}")
-                            except Exception as e:
+                            else:
                                 print(f"{console.warning(f'⚠️ Could not get data for {ticker}, but including it anyway')}")
-                                valid_tickers.append(ticker)
                     
                     if not valid_tickers:
                         print(f"{console.warning('No valid tickers found in news articles')}")
@@ -199,7 +208,6 @@ News articles to analyze:
                 
         except Exception as e:
             print(f"{console.error(f'Error extracting tickers: {str(e)}')}")
-            import traceback
             print(f"{console.error('Traceback:')}")
             print(f"{console.error(traceback.format_exc())}")
             return []
@@ -209,9 +217,8 @@ News articles to analyze:
         try:
             print(f"\nAnalyzing {ticker}...")
             
-            # Initialize and use SingleStockMode for detailed analysis
-            single_stock = SingleStockMode()
-            result = single_stock.run(ticker)
+            # Use SingleStockMode for detailed analysis
+            result = self.single_stock_mode.run(ticker)
             
             if not result["success"]:
                 print(f"Failed to analyze {ticker}: {result.get('error', 'Unknown error')}")
@@ -235,7 +242,6 @@ News articles to analyze:
             
         except Exception as e:
             print(f"Error analyzing {ticker}: {str(e)}")
-            import traceback
             print("Traceback:")
             print(traceback.format_exc())
             return None
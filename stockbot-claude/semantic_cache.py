@@ -0,0 +1,92 @@
+from typing import Dict, List, Optional
+from collections import OrderedDict
+import copy
+import hashlib
+import threading
+import hnswlib
+import numpy as np
+
+class SemanticCache:
+    """Two-tier analysis cache: exact text hash first, then nearest-neighbour embedding match
+    
+    Holds at most max_elements values; the least recently used one is evicted, and
+    its slot in the embedding index reused, once the cache is full.
+    """
+
+    def __init__(self, threshold: float = 0.05, max_elements: int = 10000):
+        self.threshold = threshold  # Maximum cosine distance that still counts as a hit
+        self.max_elements = max_elements
+        self.index = None  # Created on first insert once the embedding size is known
+        self.exact = {}  # Text key -> label
+        self.values: "OrderedDict[int, Dict]" = OrderedDict()  # Label -> value, least recently used first
+        self.text_keys = {}  # Label -> text key, to drop the exact entry on eviction
+        self.indexed = set()  # Labels with a vector in the index
+        self.next_label = 0
+        self.lock = threading.Lock()
+
+    def _text_key(self, text: str) -> str:
+        """Hash text into a compact exact-match key"""
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _hit(self, label: int) -> Dict:
+        """Mark a value most recently used and return a copy of it; callers hold the lock"""
+        self.values.move_to_end(label)
+        return copy.deepcopy(self.values[label])
+
+    def _remove(self, label: int) -> None:
+        """Drop a value, its exact key and its vector; callers hold the lock"""
+        del self.values[label]
+        self.exact.pop(self.text_keys.pop(label), None)
+        if label in self.indexed:
+            self.indexed.discard(label)
+            self.index.mark_deleted(label)
+
+    def get_exact(self, text: str) -> Optional[Dict]:
+        """Return the stored value for identical text"""
+        with self.lock:
+            label = self.exact.get(self._text_key(text))
+            if label is None:
+                return None
+            return self._hit(label)
+
+    def get_similar(self, embedding: List[float]) -> Optional[Dict]:
+        """Return the stored value whose embedding is within the distance threshold"""
+        with self.lock:
+            if not self.indexed:
+                return None
+            vector = np.asarray([embedding], dtype=np.float32)
+            if vector.shape[1] != self.index.dim:
+                return None
+            labels, distances = self.index.knn_query(vector, k=1)
+            label = int(labels[0][0])
+            if distances[0][0] > self.threshold or label not in self.values:
+                return None
+            return self._hit(label)
+
+    def put(self, text: str, embedding: Optional[List[float]], value: Dict) -> None:
+        """Store a value under its exact text key and, when available, its embedding"""
+        with self.lock:
+            text_key = self._text_key(text)
+            if text_key in self.exact:
+                self._remove(self.exact[text_key])
+            while len(self.values) >= self.max_elements:
+                self._remove(next(iter(self.values)))
+            
+            label = self.next_label
+            self.next_label += 1
+            self.values[label] = copy.deepcopy(value)
+            self.exact[text_key] = label
+            self.text_keys[label] = text_key
+
+            if embedding is None:
+                return
+            vector = np.asarray([embedding], dtype=np.float32)
+            if self.index is None:
+                self.index = hnswlib.Index(space="cosine", dim=vector.shape[1])
+                # Evicted entries leave deleted slots that new vectors take over, so the index never grows
+                self.index.init_index(max_elements=self.max_elements, ef_construction=100, M=16,
+                                      allow_replace_deleted=True)
+            if vector.shape[1] != self.index.dim:
+                return
+            self.index.add_items(vector, np.asarray([label]), replace_deleted=True)
+            self.indexed.add(label)
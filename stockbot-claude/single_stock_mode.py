@@ -1,4 +1,7 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime
 from news_search import NewsSearcher
 from ai_analysis import AIAnalyzer
@@ -7,6 +10,8 @@ from database import DatabaseHandler
 import json
 
 class SingleStockMode:
+    _MAX_SUMMARY_PARTS = 8  # Latest research findings carried into each follow-up questions prompt
+    
     def __init__(self):
         print("\n=== Initializing Single Stock Mode ===")
         self.news_searcher = NewsSearcher()
@@ -122,13 +127,17 @@ class SingleStockMode:
         
         # Convert initial context to string if it's a dict
         if isinstance(initial_context, dict):
-            current_summary = f"""
-            Market Impact: {initial_context.get('market_impact', '')}
-            Sentiment: {initial_context.get('sentiment', 'neutral')}
-            Key Points: {', '.join(initial_context.get('key_points', []))}
-            """
+            base_summary = (
+                f"Market Impact: {initial_context.get('market_impact', '')}\n"
+                f"Sentiment: {initial_context.get('sentiment', 'neutral')}\n"
+                f"Key Points: {', '.join(initial_context.get('key_points', []))}"
+            )
         else:
-            current_summary = str(initial_context)
+            base_summary = str(initial_context)
+        
+        # Findings are kept as separate parts and only the latest few are sent with the
+        # initial context, so the questions prompt stops growing with every answer
+        summary_parts = deque(maxlen=self._MAX_SUMMARY_PARTS)
         
         # Perform multiple rounds of analysis
         for round_num in range(2):
@@ -141,52 +150,32 @@ class SingleStockMode:
             
             # Generate targeted questions
             print("\n❓ Generating targeted questions...")
+            current_summary = "\n".join([base_summary, *summary_parts])
             questions = self.ai_analyzer.generate_follow_up_questions(ticker, current_summary)
             print(f"Generated {len(questions)} questions")
             
-            for i, q in enumerate(questions):
-                print(f"\n📝 Question {i+1}: {q.get('text', '')}")
-                print(f"🔧 Using research tool: {q.get('tool', 'unknown')}")
+            # Questions in a round are independent, so research and analyze them concurrently;
+            # one question's LLM analysis overlaps another's search
+            with ThreadPoolExecutor(max_workers=len(questions) or 1) as executor:
+                outcomes = list(executor.map(
+                    partial(self._research_question, ticker), range(1, len(questions) + 1), questions
+                ))
+            
+            for outcome in outcomes:
+                if outcome is None:
+                    continue
+                q, tool, analysis = outcome
+                round_findings["questions"].append(q)
+                round_findings["answers"].append(analysis)
+                round_findings["tools_used"].append(tool)
                 
-                # Use appropriate research tool
-                try:
-                    tool = q.get('tool', '').lower()
-                    if 'news_search' in tool:
-                        results = self.news_searcher.search_stock_news(ticker, q.get('text', ''))
-                    elif 'financial_data' in tool:
-                        results = self.stock_data.get_detailed_financials(ticker)
-                    elif 'market_analysis' in tool:
-                        results = self.stock_data.get_market_analysis(ticker)
-                    else:
-                        # Default to news search if tool is unknown
-                        results = self.news_searcher.search_stock_news(ticker, q.get('text', ''))
-                        tool = 'news_search'
-                    
-                    print("✅ Got research results")
-                    
-                    # Analyze results
-                    print("🔄 Analyzing results...")
-                    analysis = self.ai_analyzer.analyze_content({
-                        "success": True,
-                        "content": str(results),
-                        "metadata": {"source": tool}
-                    })
-                    
-                    round_findings["questions"].append(q)
-                    round_findings["answers"].append(analysis)
-                    round_findings["tools_used"].append(tool)
-                    
-                    # Update context for next questions - ensure we're adding strings
-                    if analysis and isinstance(analysis, dict):
-                        new_context = f"""
-                        Market Impact: {analysis.get('market_impact', '')}
-                        Sentiment: {analysis.get('sentiment', {}).get('direction', 'neutral')}
-                        Key Points: {', '.join(analysis.get('key_points', []))}
-                        """
-                        current_summary += "\n" + new_context
-                    
-                except Exception as e:
-                    print(f"⚠️ Error processing question: {str(e)}")
+                # Update context for next questions - ensure we're adding strings
+                if analysis and isinstance(analysis, dict):
+                    summary_parts.append(
+                        f"Market Impact: {analysis.get('market_impact', '')}\n"
+                        f"Sentiment: {analysis.get('sentiment', {}).get('direction', 'neutral')}\n"
+                        f"Key Points: {', '.join(analysis.get('key_points', []))}"
+                    )
             
             all_findings["rounds"].append(round_findings)
             
@@ -199,6 +188,43 @@ class SingleStockMode:
         print(f"\n✅ Deep analysis complete with {len(all_findings['key_insights'])} key insights")
         return all_findings
     
+    def _research_question(self, ticker: str, number: int, q: Dict) -> Optional[Tuple[Dict, str, Dict]]:
+        """Run one follow-up question's research tool and analyze the results
+        
+        Returns (question, tool, analysis), or None if the question failed.
+        """
+        print(f"\n📝 Question {number}: {q.get('text', '')}")
+        print(f"🔧 Using research tool: {q.get('tool', 'unknown')}")
+        
+        # Use appropriate research tool
+        try:
+            tool = q.get('tool', '').lower()
+            if 'news_search' in tool:
+                results = self.news_searcher.search_stock_news(ticker, q.get('text', ''))
+            elif 'financial_data' in tool:
+                results = self.stock_data.get_detailed_financials(ticker)
+            elif 'market_analysis' in tool:
+                results = self.stock_data.get_market_analysis(ticker)
+            else:
+                # Default to news search if tool is unknown
+                results = self.news_searcher.search_stock_news(ticker, q.get('text', ''))
+                tool = 'news_search'
+            
+            print(f"✅ Got research results for question {number}")
+            
+            # Analyze results
+            print(f"🔄 Analyzing results for question {number}...")
+            analysis = self.ai_analyzer.analyze_content({
+                "success": True,
+                "content": str(results),
+                "metadata": {"source": tool}
+            })
+            return q, tool, analysis
+            
+        except Exception as e:
+            print(f"⚠️ Error processing question {number}: {str(e)}")
+            return None
+    
     def _make_trading_decision(self, ticker: str, stock_data: Dict, detailed_analysis: Dict) -> Dict:
         """Generate final trading decision based on deep analysis"""
         print("\n=== Generating Trading Decision ===")
@@ -284,7 +310,7 @@ Format your decision as JSON:
 }}"""
         
         try:
-            decision = json.loads(self.ai_analyzer._generate_response(decision_prompt))
+            decision = json.loads(self.ai_analyzer.generate_response(decision_prompt))
         except json.JSONDecodeError:
             print("⚠️ Error parsing decision JSON, using default hold decision")
             decision = {
@@ -365,9 +391,9 @@ Format your decision as JSON:
                         "analysis": analysis_data
                     }
                     
-                    self.ai_analyzer.chroma_handler.save_document(
+                    self.ai_analyzer.chroma_handler.save_json_document(
                         collection_name="trades",  # Changed from trading_decisions to trades
-                        document=json.dumps(chroma_trade_data, indent=4),
+                        payload=chroma_trade_data,  # Serialized by the handler
                         metadata={
                             "ticker": ticker,
                             "action": decision["action"],
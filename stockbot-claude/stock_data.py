@@ -1,11 +1,25 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
+import diskcache
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
+import re
 import time
+from config import TICKER_CACHE_DIR, TICKER_CACHE_TTL
+
+# Shape of a US ticker symbol, optionally with a share class or series suffix (BRK.B, BRK-B)
+_TICKER_RE = re.compile(r"^[A-Z]{1,5}(?:[.-][A-Z]{1,2})?$")
+
+def normalize_ticker(ticker) -> str:
+    """Return a ticker in the form yfinance expects (upper case, BRK.B as BRK-B), or "" if it is not ticker-shaped"""
+    symbol = ticker.strip().upper() if isinstance(ticker, str) else ""
+    return symbol.replace(".", "-") if _TICKER_RE.match(symbol) else ""
 
 class StockDataHandler:
+    # Validated tickers shared by every handler in the process, persisted across runs
+    _ticker_cache = None
+    
     def __init__(self):
         # Define sector mappings
         self.sector_mapping = {
@@ -154,6 +168,98 @@ class StockDataHandler:
             print(f"❌ {error_msg}")
             return self._create_error_response(error_msg)
     
+    def get_many(self, tickers: List[str], period: str = "1d") -> Dict[str, Dict]:
+        """Download price history for several tickers in one multi-symbol request
+        
+        Returns {ticker: {"success": bool, "data": DataFrame or None}} keyed by the
+        tickers as given; a ticker succeeds when its history has at least one Close.
+        """
+        symbols = {}
+        for ticker in tickers:
+            symbol = normalize_ticker(ticker)
+            if symbol:
+                symbols[ticker] = symbol
+        
+        results = {ticker: {"success": False, "data": None} for ticker in tickers}
+        unique_symbols = sorted(set(symbols.values()))
+        if not unique_symbols:
+            return results
+        
+        try:
+            print(f"Fetching {len(unique_symbols)} tickers in one request...")
+            data = yf.download(
+                tickers=" ".join(unique_symbols),
+                period=period,
+                group_by="ticker",
+                threads=True,
+                progress=False
+            )
+        except Exception as e:
+            print(f"❌ Batch download failed: {str(e)}")
+            return results
+        
+        frames = {}
+        if not data.empty:
+            for symbol in unique_symbols:
+                try:
+                    # Single-symbol downloads come back without the ticker column level
+                    frame = data[symbol] if isinstance(data.columns, pd.MultiIndex) else data
+                    frame = frame.dropna(subset=['Close'])
+                    if not frame.empty:
+                        frames[symbol] = frame
+                except KeyError:
+                    continue
+        
+        for ticker, symbol in symbols.items():
+            if symbol in frames:
+                results[ticker] = {"success": True, "data": frames[symbol]}
+        return results
+    
+    @classmethod
+    def _get_ticker_cache(cls) -> Optional[diskcache.Cache]:
+        """Return the on-disk ticker validation cache, or None when it is disabled or unavailable"""
+        if cls._ticker_cache is None:
+            cls._ticker_cache = False
+            if TICKER_CACHE_DIR:
+                try:
+                    cls._ticker_cache = diskcache.Cache(TICKER_CACHE_DIR)
+                except Exception as e:
+                    print(f"⚠️ Failed to open ticker cache at {TICKER_CACHE_DIR}: {str(e)}")
+        return cls._ticker_cache or None
+    
+    def validate_tickers_batch(self, tickers: List[str]) -> Dict[str, bool]:
+        """Check which tickers have recent price data using one multi-symbol download
+        
+        Keys are the tickers as given; a ticker is valid when its latest day has a Close.
+        Tickers validated within TICKER_CACHE_TTL are trusted without a request. Only
+        valid tickers are cached, so a failed download never marks one invalid for long.
+        """
+        valid = {}
+        cache = self._get_ticker_cache()
+        if cache is not None:
+            for ticker in tickers:
+                symbol = normalize_ticker(ticker)
+                try:
+                    if symbol and cache.get(symbol):
+                        valid[ticker] = True
+                except Exception as e:
+                    print(f"⚠️ Failed to read ticker cache: {str(e)}")
+                    break
+        
+        missing = [ticker for ticker in tickers if ticker not in valid]
+        print(f"Ticker cache: {len(valid)} hits, {len(missing)} misses")
+        if not missing:
+            return valid
+        
+        for ticker, result in self.get_many(missing, period="1d").items():
+            valid[ticker] = result["success"]
+            if result["success"] and cache is not None:
+                try:
+                    cache.set(normalize_ticker(ticker), True, expire=TICKER_CACHE_TTL)
+                except Exception as e:
+                    print(f"⚠️ Failed to write ticker cache: {str(e)}")
+        return valid
+    
     def get_market_overview(self) -> Dict:
         """Get overview of major market indices"""
         indices = ['^GSPC', '^DJI', '^IXIC', '^RUT']  # S&P 500, Dow Jones, NASDAQ, Russell 2000
@@ -0,0 +1,32 @@
+import re
+
+_TICKER_LIKE = re.compile(r"\b[A-Z]{1,5}\b")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def extract_relevant(text: str, max_chars: int = 4000) -> str:
+    """Clip article text to about max_chars, keeping what matters most to the LLM
+
+    Keeps the opening half of the budget and the closing quarter, then fills the
+    rest with sentences from the middle that mention a ticker-like symbol.
+    """
+    if not text or len(text) <= max_chars:
+        return text
+
+    head_chars = max_chars // 2
+    tail_chars = max_chars // 4
+    head = text[:head_chars]
+    tail = text[-tail_chars:]
+
+    budget = max_chars - head_chars - tail_chars
+    kept = []
+    for sentence in _SENTENCE_SPLIT.split(text[head_chars:-tail_chars]):
+        sentence = sentence.strip()
+        if not sentence or not _TICKER_LIKE.search(sentence):
+            continue
+        if len(sentence) + 1 > budget:
+            continue
+        kept.append(sentence)
+        budget -= len(sentence) + 1
+
+    return "\n".join(part for part in (head, " ".join(kept), tail) if part)
@@ -0,0 +1,158 @@
+from typing import Any
+
+# Fastest available JSON backend: orjson, then ujson, then the standard library.
+# All three expose the same dumps/dumps_compact/loads/JSONDecodeError interface below.
+try:
+    import orjson
+
+    BACKEND = "orjson"
+    JSONDecodeError = orjson.JSONDecodeError
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> str:
+        """Serialize to indented JSON text"""
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+
+    def dumps_compact(obj: Any) -> str:
+        """Serialize to single-line JSON text, e.g. for embedding in prompts"""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+except ImportError:
+    try:
+        import ujson
+
+        BACKEND = "ujson"
+        JSONDecodeError = ujson.JSONDecodeError
+        loads = ujson.loads
+
+        def dumps(obj: Any) -> str:
+            """Serialize to indented JSON text"""
+            return ujson.dumps(obj, indent=2, ensure_ascii=False)
+
+        def dumps_compact(obj: Any) -> str:
+            """Serialize to single-line JSON text, e.g. for embedding in prompts"""
+            return ujson.dumps(obj, ensure_ascii=False)
+
+    except ImportError:
+        import json
+
+        BACKEND = "json"
+        JSONDecodeError = json.JSONDecodeError
+        loads = json.loads
+
+        def dumps(obj: Any) -> str:
+            """Serialize to indented JSON text"""
+            return json.dumps(obj, indent=2, ensure_ascii=False)
+
+        def dumps_compact(obj: Any) -> str:
+            """Serialize to single-line JSON text, e.g. for embedding in prompts"""
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+_WHITESPACE = " \t\r\n"
+_STRING_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+def _is_literal_char(ch: str) -> bool:
+    """True for characters that continue a number or true/false/null literal"""
+    return ch.isalnum() or ch in ".-+"
+
+
+def repair_json(text: str) -> str:
+    """Fix common LLM JSON mistakes in a single pass over the text
+
+    Drops trailing commas before } or ], inserts missing commas between
+    adjacent values inside objects and arrays, and escapes raw newlines and
+    tabs inside strings. Text inside strings is otherwise left untouched.
+    """
+    out = []
+    depth = 0
+    in_string = False
+    escape = False
+    last = ""  # Last significant character outside strings; "v" marks the end of a number or literal
+    last_comma = -1  # Index in out of a comma not yet followed by a value
+    prev = ""
+
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+                last = '"'
+            elif ch in _STRING_CONTROL_ESCAPES:
+                ch = _STRING_CONTROL_ESCAPES[ch]
+            out.append(ch)
+            prev = ch
+            continue
+
+        if ch in _WHITESPACE:
+            out.append(ch)
+        elif ch in "}]":
+            if last == ",":
+                out[last_comma] = ""  # Trailing comma
+            depth = max(depth - 1, 0)
+            out.append(ch)
+            last = ch
+        elif ch == ",":
+            last_comma = len(out)
+            out.append(ch)
+            last = ch
+        elif ch == ":":
+            out.append(ch)
+            last = ch
+        else:
+            # Start of a value (or the next character of a number/literal)
+            new_token = ch in '"{[' or not _is_literal_char(prev)
+            if depth and new_token and last in ('"', "}", "]", "v"):
+                out.append(",")  # Missing separator between adjacent values
+            if ch == '"':
+                in_string = True
+            elif ch in "{[":
+                depth += 1
+                last = ch
+            else:
+                last = "v"
+            out.append(ch)
+        prev = ch
+
+    return "".join(out)
+
+
+class JsonStreamTracker:
+    """Follow streamed text to spot when the first top-level JSON object has closed"""
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escape = False
+
+    def feed(self, text: str) -> bool:
+        """Consume a fragment; return True if an outermost object closed within it"""
+        closed = False
+        for ch in text:
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == "{":
+                self.depth += 1
+                self.started = True
+            elif not self.started:
+                continue  # Ignore prose before the JSON starts
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    closed = True
+        return closed
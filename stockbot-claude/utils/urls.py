@@ -0,0 +1,18 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only record where a click came from
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "guccounter", "guce_referrer", "guce_referrer_sig", "mc_cid", "mc_eid"})
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for deduplication and cache keys
+
+    Lowercases the scheme and host, and drops the fragment, a trailing slash and
+    tracking query parameters such as utm_source.
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    ])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
@@ -5,7 +5,7 @@ from langchain_community.vectorstores import FAISS
 from langchain_ollama import OllamaEmbeddings
 from langchain.chains import RetrievalQA
 from langchain_community.llms import Ollama
-from config import OLLAMA_MODEL, OLLAMA_URL, OLLAMA_EMBEDDING_URL, OLLAMA_EMBEDDING_MODEL
+from config import OLLAMA_MODEL, OLLAMA_URL, OLLAMA_EMBEDDING_URL, OLLAMA_EMBEDDING_MODEL, SCRAPE_CACHE_DIR, SCRAPE_CACHE_TTL
 from proxy_handler import ProxyHandler
 import requests
 from typing import Dict, Optional, List, Any
@@ -23,6 +23,9 @@ from pydantic import Field
 from datetime import datetime
 import random
 import logging
+import threading
+import diskcache
+from utils.urls import normalize_url
 
 # Remove circular import
 # from news_search import NewsSearcher
@@ -32,14 +35,19 @@ logging.getLogger('selenium').setLevel(logging.WARNING)
 logging.getLogger('urllib3').setLevel(logging.WARNING)
 
 class WebScraper:
+    # Scraped pages shared by every scraper in the process, persisted across runs
+    _scrape_cache = None
+    
     def __init__(self):
         print("\n=== Initializing WebScraper ===")
         self.proxy_handler = ProxyHandler()
         self.base_url = OLLAMA_URL
         self.embedding_url = OLLAMA_EMBEDDING_URL
         self.ollama_model = OLLAMA_MODEL
+        # One browser per scraper; threads sharing this scraper take turns navigating it
+        self._driver_lock = threading.Lock()
         self.embedding_model = OLLAMA_EMBEDDING_MODEL
-        self.chroma_handler = ChromaDBHandler()
+        self.chroma_handler = ChromaDBHandler.shared()
         
         # Initialize Chrome options with better defaults
         self.chrome_options = Options()
@@ -92,6 +100,39 @@ class WebScraper:
             print(f"❌ Failed to initialize WebScraper: {str(e)}")
             raise
     
+    @classmethod
+    def _get_scrape_cache(cls) -> Optional[diskcache.Cache]:
+        """Return the on-disk scraped page cache, or None when it is disabled or unavailable"""
+        if cls._scrape_cache is None:
+            cls._scrape_cache = False
+            if SCRAPE_CACHE_DIR:
+                try:
+                    cls._scrape_cache = diskcache.Cache(SCRAPE_CACHE_DIR)
+                except Exception as e:
+                    print(f"⚠️ Failed to open scrape cache at {SCRAPE_CACHE_DIR}: {str(e)}")
+        return cls._scrape_cache or None
+    
+    def _cached_scrape(self, url: str) -> Optional[Dict]:
+        """Return the page scraped from this URL within SCRAPE_CACHE_TTL, if any"""
+        cache = self._get_scrape_cache()
+        if cache is None:
+            return None
+        try:
+            return cache.get(normalize_url(url))
+        except Exception as e:
+            print(f"⚠️ Failed to read scrape cache: {str(e)}")
+            return None
+    
+    def _cache_scrape(self, url: str, scraped_data: Dict) -> None:
+        """Remember a successfully scraped page for SCRAPE_CACHE_TTL seconds"""
+        cache = self._get_scrape_cache()
+        if cache is None:
+            return
+        try:
+            cache.set(normalize_url(url), scraped_data, expire=SCRAPE_CACHE_TTL)
+        except Exception as e:
+            print(f"⚠️ Failed to write scrape cache: {str(e)}")
+    
     def _determine_source(self, url: str) -> str:
         """Determine the source type from URL"""
         url_lower = url.lower()
@@ -113,7 +154,20 @@ class WebScraper:
             return 'Financial News'
 
     def scrape_and_analyze(self, url: str) -> Dict:
-        """Scrape webpage content and return structured data"""
+        """Scrape webpage content and return structured data
+        
+        Safe to call from several threads: cached pages return straight away, and
+        browser navigation is serialized so each caller gets its own page's content.
+        """
+        cached = self._cached_scrape(url) if url else None
+        if cached:
+            print(f"♻️ Scrape cache hit for {url}, skipping browser fetch")
+            return cached
+        with self._driver_lock:
+            return self._scrape(url)
+    
+    def _scrape(self, url: str) -> Dict:
+        """Load the URL in the browser and extract its content; callers hold the driver lock"""
         print("\n=== Starting Web Scraping ===")
         print(f"🎯 Target URL: {url}")
         
@@ -123,6 +177,13 @@ class WebScraper:
                 return {"success": False, "error": "Empty URL provided"}
             if not url.startswith(('http://', 'https://')):
                 return {"success": False, "error": "Invalid URL format"}
+            
+            # Another thread may have scraped this URL while we waited for the driver
+            cached = self._cached_scrape(url)
+            if cached:
+                print("♻️ Scrape cache hit, skipping browser fetch")
+                return cached
+            print("Scrape cache miss")
 
             print("\n=== SCRAPING ATTEMPT STARTED ===")
             print(f"🌐 URL: {url}")
@@ -273,6 +334,8 @@ class WebScraper:
             }
             
             print(f"\n✅ Successfully scraped {scraped_data['metadata']['source']}")
+            if content:
+                self._cache_scrape(url, scraped_data)
             return scraped_data
             
         except Exception as e: